@@ -3,17 +3,29 @@
 
 import sys
 
-from PyQt5 import QtWidgets
-from src.ui.run_ui import Main_Dialog
+from PyQt5 import QtCore, QtWidgets
 from src.ui.splash import Splash_Dialog
 
-if __name__ == "__main__":
-    app = QtWidgets.QApplication(sys.argv)
 
+def show_main_window():
+    # Imported here so the splash is already on screen while the main window
+    # module, its widgets and the evaluator back-end are being loaded
+    from src.ui.run_ui import Main_Dialog
+    global ui
     ui = Main_Dialog()
     ui.show()
+    # Keep the splash above the main window, as when it was shown last
+    splash.raise_()
+
+
+if __name__ == "__main__":
+    app = QtWidgets.QApplication(sys.argv)
 
     splash = Splash_Dialog()
     splash.show()
+    app.processEvents()
+
+    # Build the main window on the first tick of the event loop
+    QtCore.QTimer.singleShot(0, show_main_window)
 
     sys.exit(app.exec_())
@@ -0,0 +1,188 @@
+from collections import Counter
+from functools import cached_property
+
+import numpy as np
+
+from .utils.enumerators import BBFormat
+
+
+class BoundingBoxes:
+    """ Structure-of-arrays representation of a list of bounding boxes.
+
+        The coordinates, confidences, images and classes of the boxes are held in contiguous
+        numpy arrays, so the evaluators can process all boxes of an image (or of the whole set) at
+        once instead of querying each BoundingBox object.
+    """
+    def __init__(self, bbs, image_index=None, class_index=None):
+        """ Constructor.
+
+        Parameters
+        ----------
+            bbs : list
+                List of BoundingBox objects.
+            image_index : dict (optional)
+                Dictionary mapping image names to integer ids. Names not in it are added with the
+                next free id. Pass the image_index of another BoundingBoxes so the ids of both sets
+                refer to the same images.
+            class_index : dict (optional)
+                Same as image_index for the class ids.
+        """
+        self.bbs = list(bbs)
+        self.image_index = {} if image_index is None else image_index
+        self.class_index = {} if class_index is None else class_index
+        n = len(self.bbs)
+        # Absolute (x1, y1, x2, y2) coordinates, one row per box. float64: with float32, IOUs
+        # landing exactly on a threshold (common with integer pixel boxes) may not match
+        self.xyxy = np.array(
+            [bb.get_absolute_bounding_box(format=BBFormat.XYX2Y2) for bb in self.bbs],
+            dtype=np.float64).reshape(n, 4)
+        # Confidences (NaN for boxes without confidence, such as ground truths)
+        self.scores = np.array(
+            [np.nan if bb.get_confidence() is None else bb.get_confidence() for bb in self.bbs],
+            dtype=np.float64)
+        # Integer ids of the image and of the class of each box
+        self.image_ids = np.array([
+            self.image_index.setdefault(bb.get_image_name(), len(self.image_index))
+            for bb in self.bbs
+        ],
+                                  dtype=np.int32)
+        self.labels = np.array([
+            self.class_index.setdefault(bb.get_class_id(), len(self.class_index))
+            for bb in self.bbs
+        ],
+                               dtype=np.int32)
+        # area_range -> mask returned by outside_area
+        self._outside = {}
+
+    @staticmethod
+    def of(bbs, image_index=None, class_index=None):
+        """ Return bbs itself if it is already a BoundingBoxes sharing the given indexes, or a new
+            BoundingBoxes built from it otherwise. """
+        if isinstance(bbs, BoundingBoxes) and (image_index is None
+                                               or bbs.image_index is image_index) and (
+                                                   class_index is None
+                                                   or bbs.class_index is class_index):
+            return bbs
+        return BoundingBoxes(bbs, image_index=image_index, class_index=class_index)
+
+    def __len__(self):
+        return len(self.scores)
+
+    def __iter__(self):
+        return iter(self.bbs)
+
+    def __getitem__(self, idx):
+        return self.bbs[idx]
+
+    @cached_property
+    def areas(self):
+        """ Areas of the boxes with the open-ended convention (x2 - x1) * (y2 - y1).
+
+            Computed on first access and kept, as the COCO evaluator reads them once per
+            IOU threshold and area range.
+        """
+        return (self.xyxy[:, 2] - self.xyxy[:, 0]) * (self.xyxy[:, 3] - self.xyxy[:, 1])
+
+    @cached_property
+    def score_order(self):
+        """ Positions of the boxes by decreasing confidence, boxes with equal confidences keeping
+            their order.
+
+            Computed on first access and kept, so the detections are sorted once for all the
+            evaluators they are passed to.
+        """
+        return np.argsort(-self.scores, kind='stable')
+
+    def outside_area(self, area_range):
+        """ Return a boolean array flagging the boxes whose area is outside area_range.
+
+        Parameters
+        ----------
+            area_range : (numerical x numerical) or None
+                Lower and upper bounds (inclusive) of the areas. None accepts every area.
+
+        Returns:
+            np.ndarray: True for the boxes outside the range. The array is shared by every call
+            with the same range, so it must not be modified.
+        """
+        mask = self._outside.get(area_range)
+        if mask is None:
+            if area_range is None:
+                mask = np.zeros(len(self.bbs), dtype=bool)
+            else:
+                mask = ~((area_range[0] <= self.areas) & (self.areas <= area_range[1]))
+            self._outside[area_range] = mask
+        return mask
+
+    def arrays_only(self):
+        """ Return a BoundingBoxes sharing the arrays and indexes of this one, but without its
+            BoundingBox objects (bbs is None, so it cannot be iterated or indexed).
+
+            The evaluators only read the arrays, and this copy is much cheaper to pickle to the
+            processes running them. Properties already computed (such as score_order) are kept.
+        """
+        copy = BoundingBoxes.__new__(BoundingBoxes)
+        copy.__dict__.update(self.__dict__)
+        copy.bbs = None
+        copy._outside = dict(self._outside)
+        return copy
+
+    def take(self, indices):
+        """ Return a BoundingBoxes with the boxes at the given positions, sharing the indexes. """
+        indices = np.asarray(indices, dtype=np.int64)
+        subset = BoundingBoxes.__new__(BoundingBoxes)
+        subset.bbs = None if self.bbs is None else [self.bbs[i] for i in indices]
+        subset.image_index = self.image_index
+        subset.class_index = self.class_index
+        subset.xyxy = self.xyxy[indices]
+        subset.scores = self.scores[indices]
+        subset.image_ids = self.image_ids[indices]
+        subset.labels = self.labels[indices]
+        subset._outside = {}
+        return subset
+
+    def group_keys(self, n_classes=None):
+        """ Return one integer key per box identifying its (image, class) pair. """
+        if n_classes is None:
+            n_classes = len(self.class_index)
+        return self.image_ids.astype(np.int64) * max(n_classes, 1) + self.labels
+
+
+def group_indices(keys):
+    """ Group positions by key.
+
+    Parameters
+    ----------
+        keys : np.ndarray
+            Integer key of each element.
+
+    Returns:
+        dict: key -> array with the positions of the elements with that key, in their original
+        order. Keys are sorted in increasing order.
+    """
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+    unique_keys = np.unique(sorted_keys)
+    starts = np.searchsorted(sorted_keys, unique_keys, side='left')
+    ends = np.searchsorted(sorted_keys, unique_keys, side='right')
+    return {int(k): order[s:e] for k, s, e in zip(unique_keys, starts, ends)}
+
+
+def count_iou_pairs(gt_bbs, det_bbs):
+    """ Count the (detection, ground truth) pairs whose IOU the evaluators compute.
+
+        Boxes are only compared with the boxes of the same image and class, so this is the sum
+        over the (image, class) groups of n_detections * n_ground_truths.
+
+    Parameters
+    ----------
+        gt_bbs : list or BoundingBoxes
+            Ground-truth bounding boxes.
+        det_bbs : list or BoundingBoxes
+            Detected bounding boxes.
+
+    Returns:
+        int: number of pairs.
+    """
+    gt_counts = Counter((bb.get_image_name(), bb.get_class_id()) for bb in gt_bbs)
+    return sum(gt_counts[bb.get_image_name(), bb.get_class_id()] for bb in det_bbs)
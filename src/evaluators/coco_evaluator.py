@@ -22,7 +22,7 @@
 from collections import defaultdict
 
 import numpy as np
-from src.bounding_box import BBFormat
+from src.bounding_boxes import BoundingBoxes, group_indices
 
 
 def get_coco_summary(groundtruth_bbs, detected_bbs):
@@ -38,9 +38,9 @@ def get_coco_summary(groundtruth_bbs, detected_bbs):
 
     Parameters
         ----------
-            groundtruth_bbs : list
+            groundtruth_bbs : list or BoundingBoxes
                 A list containing objects of type BoundingBox representing the ground-truth bounding boxes.
-            detected_bbs : list
+            detected_bbs : list or BoundingBoxes
                 A list containing objects of type BoundingBox representing the detected bounding boxes.
     Returns:
             A dictionary with one entry for each metric.
@@ -179,9 +179,9 @@ def get_coco_metrics(
         given an IOU threshold, area range and maximum number of detections.
     Parameters
         ----------
-            groundtruth_bbs : list
+            groundtruth_bbs : list or BoundingBoxes
                 A list containing objects of type BoundingBox representing the ground-truth bounding boxes.
-            detected_bbs : list
+            detected_bbs : list or BoundingBoxes
                 A list containing objects of type BoundingBox representing the detected bounding boxes.
             iou_threshold : float
                 Intersection Over Union (IOU) value used to consider a TP detection.
@@ -249,96 +249,99 @@ def get_coco_metrics(
 
 
 def _group_detections(dt, gt):
-    """ simply group gts and dts on a imageXclass basis """
-    bb_info = defaultdict(lambda: {"dt": [], "gt": []})
-    for d in dt:
-        i_id = d.get_image_name()
-        c_id = d.get_class_id()
-        bb_info[i_id, c_id]["dt"].append(d)
-    for g in gt:
-        i_id = g.get_image_name()
-        c_id = g.get_class_id()
-        bb_info[i_id, c_id]["gt"].append(g)
-    return bb_info
+    """ simply group gts and dts on a imageXclass basis
 
+        Returns a dictionary (image name, class id) -> {"dt": BoundingBoxes, "gt": BoundingBoxes}
+        with the pairs in the order they first appear, detections first. The detections of each
+        pair are sorted by decreasing confidence.
+    """
+    gt = BoundingBoxes.of(gt)
+    dt = BoundingBoxes.of(dt, image_index=gt.image_index, class_index=gt.class_index)
+    image_names = list(gt.image_index)
+    class_ids = list(gt.class_index)
+    n_classes = max(len(class_ids), 1)
+
+    dt_keys = dt.group_keys(n_classes)
+    gt_keys = gt.group_keys(n_classes)
+    # positions of the detections of each group, by decreasing confidence
+    dt_order = dt.score_order
+    dt_groups = {k: dt_order[v] for k, v in group_indices(dt_keys[dt_order]).items()}
+    gt_groups = group_indices(gt_keys)
+    all_keys, first = np.unique(np.concatenate([dt_keys, gt_keys]), return_index=True)
+
+    empty = np.zeros(0, dtype=np.int64)
+    bb_info = {}
+    for k in all_keys[np.argsort(first, kind="stable")].tolist():
+        bb_info[image_names[k // n_classes], class_ids[k % n_classes]] = {
+            "dt": dt.take(dt_groups.get(k, empty)),
+            "gt": gt.take(gt_groups.get(k, empty)),
+        }
+    return bb_info
 
-def _get_area(a):
-    """ COCO does not consider the outer edge as included in the bbox """
-    x, y, x2, y2 = a.get_absolute_bounding_box(format=BBFormat.XYX2Y2)
-    return (x2 - x) * (y2 - y)
 
+def _compute_ious(dt, gt):
+    """ compute pairwise ious
 
-def _jaccard(a, b):
-    xa, ya, x2a, y2a = a.get_absolute_bounding_box(format=BBFormat.XYX2Y2)
-    xb, yb, x2b, y2b = b.get_absolute_bounding_box(format=BBFormat.XYX2Y2)
+        Every (dt, gt) pair is computed at once by broadcasting the (N, 1) detection
+        coordinates against the (1, M) ground truth coordinates. They are computed in float64
+        whatever the dtype of the coordinates, so IOUs equal to a threshold stay equal to it.
+    """
+    d = dt.xyxy.astype(np.float64, copy=False)
+    g = gt.xyxy.astype(np.float64, copy=False)
 
-    # innermost left x
-    xi = max(xa, xb)
-    # innermost right x
-    x2i = min(x2a, x2b)
-    # same for y
-    yi = max(ya, yb)
-    y2i = min(y2a, y2b)
+    # innermost left/right x and top/bottom y of every pair
+    xi = np.maximum(d[:, None, 0], g[None, :, 0])
+    x2i = np.minimum(d[:, None, 2], g[None, :, 2])
+    yi = np.maximum(d[:, None, 1], g[None, :, 1])
+    y2i = np.minimum(d[:, None, 3], g[None, :, 3])
 
     # calculate areas
-    Aa = max(x2a - xa, 0) * max(y2a - ya, 0)
-    Ab = max(x2b - xb, 0) * max(y2b - yb, 0)
-    Ai = max(x2i - xi, 0) * max(y2i - yi, 0)
-    return Ai / (Aa + Ab - Ai)
-
-
-def _compute_ious(dt, gt):
-    """ compute pairwise ious """
-
-    ious = np.zeros((len(dt), len(gt)))
-    for g_idx, g in enumerate(gt):
-        for d_idx, d in enumerate(dt):
-            ious[d_idx, g_idx] = _jaccard(d, g)
-    return ious
+    Ad = np.clip(d[:, 2] - d[:, 0], 0, None) * np.clip(d[:, 3] - d[:, 1], 0, None)
+    Ag = np.clip(g[:, 2] - g[:, 0], 0, None) * np.clip(g[:, 3] - g[:, 1], 0, None)
+    Ai = np.clip(x2i - xi, 0, None) * np.clip(y2i - yi, 0, None)
+    # pairs that are disjoint on either axis have Ai == 0; their IoU is left at 0
+    # without dividing, which also avoids 0/0 between degenerate boxes
+    return np.divide(Ai, Ad[:, None] + Ag[None, :] - Ai, out=np.zeros_like(Ai), where=Ai > 0)
 
 
 def _evaluate_image(dt, gt, ious, iou_threshold, max_dets=None, area_range=None):
     """ use COCO's method to associate detections to ground truths """
-    # sort dts by increasing confidence
-    dt_sort = np.argsort([-d.get_confidence() for d in dt], kind="stable")
-
-    # sort list of dts and chop by max dets
-    dt = [dt[idx] for idx in dt_sort[:max_dets]]
-    ious = ious[dt_sort[:max_dets]]
+    # dts are already sorted by decreasing confidence (see _group_detections), chop by max dets
+    dt_scores = dt.scores[:max_dets]
+    ious = ious[:max_dets]
 
     # generate ignored gt list by area_range
-    def _is_ignore(bb):
-        if area_range is None:
-            return False
-        return not (area_range[0] <= _get_area(bb) <= area_range[1])
-
-    gt_ignore = [_is_ignore(g) for g in gt]
+    gt_ignore = gt.outside_area(area_range)
 
     # sort gts by ignore last
     gt_sort = np.argsort(gt_ignore, kind="stable")
-    gt = [gt[idx] for idx in gt_sort]
-    gt_ignore = [gt_ignore[idx] for idx in gt_sort]
+    gt_ignore = gt_ignore[gt_sort]
     ious = ious[:, gt_sort]
 
+    # the greedy matching below is scalar code, which runs faster on Python lists
+    gt_ignore_l = gt_ignore.tolist()
+    ious_l = ious.tolist()
+    n_gt = len(gt_ignore_l)
+
     gtm = {}
     dtm = {}
 
-    for d_idx, d in enumerate(dt):
+    for d_idx in range(len(ious_l)):
         # information about best match so far (m=-1 -> unmatched)
         iou = min(iou_threshold, 1 - 1e-10)
         m = -1
-        for g_idx, g in enumerate(gt):
+        for g_idx in range(n_gt):
             # if this gt already matched, and not a crowd, continue
             if g_idx in gtm:
                 continue
             # if dt matched to reg gt, and on ignore gt, stop
-            if m > -1 and gt_ignore[m] == False and gt_ignore[g_idx] == True:
+            if m > -1 and gt_ignore_l[m] == False and gt_ignore_l[g_idx] == True:
                 break
             # continue to next gt unless better match made
-            if ious[d_idx, g_idx] < iou:
+            if ious_l[d_idx][g_idx] < iou:
                 continue
             # if match successful and best so far, store appropriately
-            iou = ious[d_idx, g_idx]
+            iou = ious_l[d_idx][g_idx]
             m = g_idx
         # if match made store id of match for both dt and gt
         if m == -1:
@@ -347,15 +350,17 @@ def _evaluate_image(dt, gt, ious, iou_threshold, max_dets=None, area_range=None)
         gtm[m] = d_idx
 
     # generate ignore list for dts
-    dt_ignore = [
-        gt_ignore[dtm[d_idx]] if d_idx in dtm else _is_ignore(d) for d_idx, d in enumerate(dt)
-    ]
+    matched = np.zeros(len(dt_scores), dtype=bool)
+    dt_ignore = dt.outside_area(area_range)[:max_dets].copy()
+    for d_idx, m in dtm.items():
+        matched[d_idx] = True
+        dt_ignore[d_idx] = gt_ignore_l[m]
 
     # get score for non-ignored dts
-    scores = [dt[d_idx].get_confidence() for d_idx in range(len(dt)) if not dt_ignore[d_idx]]
-    matched = [d_idx in dtm for d_idx in range(len(dt)) if not dt_ignore[d_idx]]
+    scores = dt_scores[~dt_ignore]
+    matched = matched[~dt_ignore]
 
-    n_gts = len([g_idx for g_idx in range(len(gt)) if not gt_ignore[g_idx]])
+    n_gts = int(np.count_nonzero(~gt_ignore))
     return {"scores": scores, "matched": matched, "NP": n_gts}
 
 
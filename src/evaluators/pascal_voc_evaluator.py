@@ -1,59 +1,96 @@
 import os
 import sys
-from collections import Counter
+from itertools import repeat
 
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
-from src.bounding_box import BoundingBox
+from src.bounding_boxes import BoundingBoxes
 from src.utils.enumerators import (BBFormat, CoordinatesType,
                                    MethodAveragePrecision)
 
+try:
+    from numba import njit
+except ImportError:
+    # numba is optional: without it the matching runs as plain Python
+    def njit(*args, **kwargs):
+        return lambda f: f
+
+
+# IOUs must be above this value for a gt to be a candidate match (see _assign)
+_MIN_IOU = sys.float_info.min
+
+
+def _compute_ious(dt, gt):
+    """ compute the (N, M) IOUs of the (N, 4) dt and (M, 4) gt absolute (x, y, x2, y2) arrays.
+
+        Same convention as BoundingBox.iou: the edges are part of the box (hence the + 1) and
+        boxes that do not overlap have IOU 0. The IOUs are computed in float64 whatever the dtype
+        of the coordinates, so _assign compares them to the threshold the same way with or
+        without numba.
+    """
+    dt = dt.astype(np.float64, copy=False)
+    gt = gt.astype(np.float64, copy=False)
+    xa = np.maximum(dt[:, None, 0], gt[None, :, 0])
+    ya = np.maximum(dt[:, None, 1], gt[None, :, 1])
+    xb = np.minimum(dt[:, None, 2], gt[None, :, 2])
+    yb = np.minimum(dt[:, None, 3], gt[None, :, 3])
+    overlap = (xb >= xa) & (yb >= ya)
+    inter = np.where(overlap, (xb - xa + 1) * (yb - ya + 1), 0.)
+    area_dt = (dt[:, 2] - dt[:, 0] + 1) * (dt[:, 3] - dt[:, 1] + 1)
+    area_gt = (gt[:, 2] - gt[:, 0] + 1) * (gt[:, 3] - gt[:, 1] + 1)
+    union = area_dt[:, None] + area_gt[None, :] - inter
+    return np.divide(inter, union, out=np.zeros_like(inter), where=overlap)
+
+
+@njit(cache=True)
+def _assign(ious, iou_threshold):
+    """ greedily match the detections of one image, sorted by decreasing confidence, to its gts.
+
+        Each detection takes the gt with the highest IOU (the first one on ties). It is a TP if
+        that IOU is >= iou_threshold and the gt was not taken by a previous detection.
+        Returns a boolean array with True for the TP detections.
+    """
+    n_det, n_gt = ious.shape
+    tp = np.zeros(n_det, dtype=np.bool_)
+    gt_used = np.zeros(n_gt, dtype=np.bool_)
+    for d in range(n_det):
+        iou_max = _MIN_IOU
+        m = -1
+        for g in range(n_gt):
+            if ious[d, g] > iou_max:
+                iou_max = ious[d, g]
+                m = g
+        if m >= 0 and iou_max >= iou_threshold and not gt_used[m]:
+            tp[d] = True
+            gt_used[m] = True
+    return tp
+
 
 def calculate_ap_every_point(rec, prec):
-    mrec = []
-    mrec.append(0)
-    [mrec.append(e) for e in rec]
-    mrec.append(1)
-    mpre = []
-    mpre.append(0)
-    [mpre.append(e) for e in prec]
-    mpre.append(0)
-    for i in range(len(mpre) - 1, 0, -1):
-        mpre[i - 1] = max(mpre[i - 1], mpre[i])
-    ii = []
-    for i in range(len(mrec) - 1):
-        if mrec[1:][i] != mrec[0:-1][i]:
-            ii.append(i + 1)
-    ap = 0
-    for i in ii:
-        ap = ap + np.sum((mrec[i] - mrec[i - 1]) * mpre[i])
-    return [ap, mpre[0:len(mpre) - 1], mrec[0:len(mpre) - 1], ii]
+    mrec = np.concatenate(([0.], rec, [1.]))
+    mpre = np.concatenate(([0.], prec, [0.]))
+    # make the precision monotonically decreasing (running maximum from the right)
+    mpre = np.maximum.accumulate(mpre[::-1])[::-1]
+    # indexes where the recall changes
+    ii = np.flatnonzero(mrec[1:] != mrec[:-1]) + 1
+    ap = np.sum((mrec[ii] - mrec[ii - 1]) * mpre[ii])
+    return [ap, mpre[:-1].tolist(), mrec[:-1].tolist(), ii.tolist()]
 
 
 def calculate_ap_11_point_interp(rec, prec, recall_vals=11):
-    mrec = []
-    # mrec.append(0)
-    [mrec.append(e) for e in rec]
-    # mrec.append(1)
-    mpre = []
-    # mpre.append(0)
-    [mpre.append(e) for e in prec]
-    # mpre.append(0)
-    recallValues = np.linspace(0, 1, recall_vals)
-    recallValues = list(recallValues[::-1])
-    rhoInterp = []
-    recallValid = []
-    # For each recallValues (0, 0.1, 0.2, ... , 1)
-    for r in recallValues:
-        # Obtain all recall values higher or equal than r
-        argGreaterRecalls = np.argwhere(mrec[:] >= r)
-        pmax = 0
-        # If there are recalls above r
-        if argGreaterRecalls.size != 0:
-            pmax = max(mpre[argGreaterRecalls.min():])
-        recallValid.append(r)
-        rhoInterp.append(pmax)
+    rec = np.asarray(rec, dtype=np.float64)
+    prec = np.asarray(prec, dtype=np.float64)
+    recallValues = np.linspace(0, 1, recall_vals)[::-1]
+    # highest precision among the points at or after each point of the curve
+    max_prec = np.maximum.accumulate(prec[::-1])[::-1]
+    # the recall is non-decreasing, so the points whose recall is >= r start at this index
+    first = np.searchsorted(rec, recallValues, side='left')
+    rhoInterp = np.zeros(len(recallValues))
+    found = first < len(rec)
+    rhoInterp[found] = max_prec[first[found]]
+    recallValid = recallValues.tolist()
+    rhoInterp = rhoInterp.tolist()
     # By definition AP = sum(max(precision whose recall is above r))/11
     ap = sum(rhoInterp) / len(recallValues)
     # Generating values for the plot
@@ -86,8 +123,8 @@ def get_pascalvoc_metrics(gt_boxes,
                           generate_table=False):
     """Get the metrics used by the VOC Pascal 2012 challenge.
     Args:
-        boundingboxes: Object of the class BoundingBoxes representing ground truth and detected
-        bounding boxes;
+        gt_boxes, det_boxes: lists of BoundingBox objects, or BoundingBoxes, representing the
+        ground truth and detected bounding boxes;
         iou_threshold: IOU threshold indicating which detections will be considered TP or FP
         (dget_pascalvoc_metricsns:
         A dictioanry contains information and metrics of each class.
@@ -102,100 +139,78 @@ def get_pascalvoc_metrics(gt_boxes,
         dict['total TP']: total number of True Positive detections;
         dict['total FP']: total number of False Positive detections;"""
     ret = {}
-    # Get classes of all bounding boxes separating them by classes
-    gt_classes_only = []
+    # The coordinates are read from the arrays of BoundingBoxes (built here from plain lists)
+    gt_boxes = BoundingBoxes.of(gt_boxes)
+    det_boxes = BoundingBoxes.of(det_boxes,
+                                 image_index=gt_boxes.image_index,
+                                 class_index=gt_boxes.class_index)
+    # class ids by label: the boxes are grouped by their integer labels and image ids rather
+    # than by their class id and image name strings
+    class_ids = list(gt_boxes.class_index)
+    gt_labels = gt_boxes.labels.tolist()
+    gt_images = gt_boxes.image_ids.tolist()
+    det_labels = det_boxes.labels.tolist()
+    det_images = det_boxes.image_ids.tolist()
+    if generate_table:
+        # image names by image id, and confidences of the detections, for the tables
+        image_names = list(gt_boxes.image_index)
+        det_scores = det_boxes.scores.tolist()
+    # Get classes of all bounding boxes separating them by classes (positions in the arrays)
     classes_bbs = {}
-    for bb in gt_boxes:
-        c = bb.get_class_id()
-        gt_classes_only.append(c)
-        classes_bbs.setdefault(c, {'gt': [], 'det': []})
-        classes_bbs[c]['gt'].append(bb)
-    gt_classes_only = list(set(gt_classes_only))
-    for bb in det_boxes:
-        c = bb.get_class_id()
-        classes_bbs.setdefault(c, {'gt': [], 'det': []})
-        classes_bbs[c]['det'].append(bb)
+    for idx, label in enumerate(gt_labels):
+        classes_bbs.setdefault(label, {'gt': [], 'det': []})
+        classes_bbs[label]['gt'].append(idx)
+    gt_classes_only = [class_ids[label] for label in classes_bbs]
+    # the detections are visited by decreasing confidence, so each class gets them sorted
+    for idx in det_boxes.score_order.tolist():
+        label = det_labels[idx]
+        # Report results only in the classes that are in the GT
+        if label in classes_bbs:
+            classes_bbs[label]['det'].append(idx)
 
     # Precision x Recall is obtained individually by each class
-    for c, v in classes_bbs.items():
-        # Report results only in the classes that are in the GT
-        if c not in gt_classes_only:
-            continue
+    for label, v in classes_bbs.items():
+        c = class_ids[label]
         npos = len(v['gt'])
-        # sort detections by decreasing confidence
-        dects = [a for a in sorted(v['det'], key=lambda bb: bb.get_confidence(), reverse=True)]
-        TP = np.zeros(len(dects))
-        FP = np.zeros(len(dects))
-        # create dictionary with amount of expected detections for each image
-        detected_gt_per_image = Counter([bb.get_image_name() for bb in gt_boxes])
-        for key, val in detected_gt_per_image.items():
-            detected_gt_per_image[key] = np.zeros(val)
-        # print(f'Evaluating class: {c}')
-        dict_table = {
-            'image': [],
-            'confidence': [],
-            'TP': [],
-            'FP': [],
-            'acc TP': [],
-            'acc FP': [],
-            'precision': [],
-            'recall': []
-        }
-        # Loop through detections
-        for idx_det, det in enumerate(dects):
-            img_det = det.get_image_name()
-
-            if generate_table:
-                dict_table['image'].append(img_det)
-                dict_table['confidence'].append(f'{100*det.get_confidence():.2f}%')
-
-            # Find ground truth image
-            gt = [gt for gt in classes_bbs[c]['gt'] if gt.get_image_name() == img_det]
-            # Get the maximum iou among all detectins in the image
-            iouMax = sys.float_info.min
-            # Given the detection det, find ground-truth with the highest iou
-            for j, g in enumerate(gt):
-                # print('Ground truth gt => %s' %
-                #       str(g.get_absolute_bounding_box(format=BBFormat.XYX2Y2)))
-                iou = BoundingBox.iou(det, g)
-                if iou > iouMax:
-                    iouMax = iou
-                    id_match_gt = j
-            # Assign detection as TP or FP
-            if iouMax >= iou_threshold:
-                # gt was not matched with any detection
-                if detected_gt_per_image[img_det][id_match_gt] == 0:
-                    TP[idx_det] = 1  # detection is set as true positive
-                    detected_gt_per_image[img_det][
-                        id_match_gt] = 1  # set flag to identify gt as already 'matched'
-                    # print("TP")
-                    if generate_table:
-                        dict_table['TP'].append(1)
-                        dict_table['FP'].append(0)
-                else:
-                    FP[idx_det] = 1  # detection is set as false positive
-                    if generate_table:
-                        dict_table['FP'].append(1)
-                        dict_table['TP'].append(0)
-                    # print("FP")
-            # - A detected "cat" is overlaped with a GT "cat" with IOU >= iou_threshold.
-            else:
-                FP[idx_det] = 1  # detection is set as false positive
-                if generate_table:
-                    dict_table['FP'].append(1)
-                    dict_table['TP'].append(0)
-                # print("FP")
+        # detections sorted by decreasing confidence
+        dects = v['det']
+        # group the ground truths of the class by image
+        gts_per_image = {}
+        for idx in v['gt']:
+            gts_per_image.setdefault(gt_images[idx], []).append(idx)
+        # positions in dects of the detections of each image, in decreasing confidence
+        dets_per_image = {}
+        for idx_det, idx in enumerate(dects):
+            dets_per_image.setdefault(det_images[idx], []).append(idx_det)
+        # True for the detections matched to a ground truth (TP), False for the others (FP)
+        tp = np.zeros(len(dects), dtype=bool)
+        # The matching of an image does not depend on the others, so each image is matched alone
+        for img_det, det_idxs in dets_per_image.items():
+            gts = gts_per_image.get(img_det)
+            if not gts:
+                continue
+            ious = _compute_ious(det_boxes.xyxy[[dects[i] for i in det_idxs]],
+                                 gt_boxes.xyxy[gts])
+            tp[det_idxs] = _assign(ious, iou_threshold)
+        TP = tp.astype(np.float64)
+        FP = 1 - TP
         # compute precision, recall and average precision
-        acc_FP = np.cumsum(FP)
-        acc_TP = np.cumsum(TP)
+        acc_TP = np.cumsum(tp, dtype=np.int32).astype(np.float64)
+        acc_FP = np.arange(1, len(dects) + 1, dtype=np.float64) - acc_TP
         rec = acc_TP / npos
         prec = np.divide(acc_TP, (acc_FP + acc_TP))
         if generate_table:
-            dict_table['acc TP'] = list(acc_TP)
-            dict_table['acc FP'] = list(acc_FP)
-            dict_table['precision'] = list(prec)
-            dict_table['recall'] = list(rec)
-            table = pd.DataFrame(dict_table)
+            # read from the arrays, so BoundingBoxes without their objects can be evaluated
+            table = pd.DataFrame({
+                'image': [image_names[det_images[idx]] for idx in dects],
+                'confidence': [f'{100*det_scores[idx]:.2f}%' for idx in dects],
+                'TP': tp.astype(int).tolist(),
+                'FP': (~tp).astype(int).tolist(),
+                'acc TP': list(acc_TP),
+                'acc FP': list(acc_FP),
+                'precision': list(prec),
+                'recall': list(rec)
+            })
         else:
             table = None
         # Depending on the method, call the right implementation
@@ -224,27 +239,17 @@ def get_pascalvoc_metrics(gt_boxes,
     return {'per_class': ret, 'mAP': mAP}
 
 
-def plot_precision_recall_curve(results,
-                                mAP=None,
-                                showInterpolatedPrecision=False,
-                                savePath=None,
-                                showGraphic=True):
-    result = None
-    plt.close()
-    # Each resut represents a class
+def _draw_all_classes(ax, results, mAP, showInterpolatedPrecision):
+    """ Draw the precision x recall curves of every class in the given axes. """
     for classId, result in results.items():
-        if result is None:
-            raise IOError(f'Error: Class {classId} could not be found.')
-
         precision = result['precision']
         recall = result['recall']
-        average_precision = result['AP']
         mpre = result['interpolated precision']
         mrec = result['interpolated recall']
         method = result['method']
         if showInterpolatedPrecision:
             if method == MethodAveragePrecision.EVERY_POINT_INTERPOLATION:
-                plt.plot(mrec, mpre, '--r', label='Interpolated precision (every point)')
+                ax.plot(mrec, mpre, '--r', label='Interpolated precision (every point)')
             elif method == MethodAveragePrecision.ELEVEN_POINT_INTERPOLATION:
                 # Remove duplicates, getting only the highest precision of each recall value
                 nrec = []
@@ -255,128 +260,224 @@ def plot_precision_recall_curve(results,
                         idxEq = np.argwhere(mrec == r)
                         nrec.append(r)
                         nprec.append(max([mpre[int(id)] for id in idxEq]))
-                plt.plot(nrec, nprec, 'or', label='11-point interpolated precision')
-        plt.plot(recall, precision, label=f'{classId}')
-    plt.xlabel('recall')
-    plt.ylabel('precision')
-    plt.xlim([-0.1, 1.1])
-    plt.ylim([-0.1, 1.1])
+                ax.plot(nrec, nprec, 'or', label='11-point interpolated precision')
+        ax.plot(recall, precision, label=f'{classId}')
+    ax.set_xlabel('recall')
+    ax.set_ylabel('precision')
+    ax.set_xlim([-0.1, 1.1])
+    ax.set_ylim([-0.1, 1.1])
     if mAP:
         map_str = "{0:.2f}%".format(mAP * 100)
-        plt.title(f'Precision x Recall curve, mAP={map_str}')
+        ax.set_title(f'Precision x Recall curve, mAP={map_str}')
     else:
-        plt.title('Precision x Recall curve')
-    plt.legend(shadow=True)
-    plt.grid()
+        ax.set_title('Precision x Recall curve')
+    ax.legend(shadow=True)
+    ax.grid()
+
+
+def plot_precision_recall_curve(results,
+                                mAP=None,
+                                showInterpolatedPrecision=False,
+                                savePath=None,
+                                showGraphic=True):
+    """ Plot the precision x recall curves of all classes in a single graph.
+
+        When the graph is only saved (showGraphic is False), it is rendered on a standalone Agg
+        figure instead of pyplot's current one (see _agg_figure).
+    """
+    result = None
+    # Each resut represents a class
+    for classId, result in results.items():
+        if result is None:
+            raise IOError(f'Error: Class {classId} could not be found.')
+
+    if not showGraphic:
+        if savePath is not None:
+            _save_all_classes(results, mAP, showInterpolatedPrecision, savePath)
+        return results
+
+    plt.close()
+    _draw_all_classes(plt.gca(), results, mAP, showInterpolatedPrecision)
     if savePath is not None:
         plt.savefig(os.path.join(savePath, 'all_classes.png'))
-    if showGraphic is True:
-        plt.show()
-        # plt.waitforbuttonpress()
-        plt.pause(0.05)
+    plt.show()
+    # plt.waitforbuttonpress()
+    plt.pause(0.05)
     return results
 
 
+def _draw_class_curve(ax, classId, result, showAP, showInterpolatedPrecision):
+    """ Draw the precision x recall curve of a single class in the given axes. """
+    precision = result['precision']
+    recall = result['recall']
+    average_precision = result['AP']
+    mpre = result['interpolated precision']
+    mrec = result['interpolated recall']
+    method = result['method']
+    if showInterpolatedPrecision:
+        if method == MethodAveragePrecision.EVERY_POINT_INTERPOLATION:
+            ax.plot(mrec, mpre, '--r', label='Interpolated precision (every point)')
+        elif method == MethodAveragePrecision.ELEVEN_POINT_INTERPOLATION:
+            # Remove duplicates, getting only the highest precision of each recall value
+            nrec = []
+            nprec = []
+            for idx in range(len(mrec)):
+                r = mrec[idx]
+                if r not in nrec:
+                    idxEq = np.argwhere(mrec == r)
+                    nrec.append(r)
+                    nprec.append(max([mpre[int(id)] for id in idxEq]))
+            ax.plot(nrec, nprec, 'or', label='11-point interpolated precision')
+    ax.plot(recall, precision, label='Precision')
+    ax.set_xlabel('recall')
+    ax.set_ylabel('precision')
+    if showAP:
+        ap_str = "{0:.2f}%".format(average_precision * 100)
+        # ap_str = "{0:.4f}%".format(average_precision * 100)
+        ax.set_title('Precision x Recall curve \nClass: %s, AP: %s' % (str(classId), ap_str))
+    else:
+        ax.set_title('Precision x Recall curve \nClass: %s' % str(classId))
+    ax.legend(shadow=True)
+    ax.grid()
+    ############################################################
+    # Uncomment the following block to create plot with points #
+    ############################################################
+    # ax.plot(recall, precision, 'bo')
+    # labels = ['R', 'Y', 'J', 'A', 'U', 'C', 'M', 'F', 'D', 'B', 'H', 'P', 'E', 'X', 'N', 'T',
+    # 'K', 'Q', 'V', 'I', 'L', 'S', 'G', 'O']
+    # dicPosition = {}
+    # dicPosition['left_zero'] = (-30,0)
+    # dicPosition['left_zero_slight'] = (-30,-10)
+    # dicPosition['right_zero'] = (30,0)
+    # dicPosition['left_up'] = (-30,20)
+    # dicPosition['left_down'] = (-30,-25)
+    # dicPosition['right_up'] = (20,20)
+    # dicPosition['right_down'] = (20,-20)
+    # dicPosition['up_zero'] = (0,30)
+    # dicPosition['up_right'] = (0,30)
+    # dicPosition['left_zero_long'] = (-60,-2)
+    # dicPosition['down_zero'] = (-2,-30)
+    # vecPositions = [
+    #     dicPosition['left_down'],
+    #     dicPosition['left_zero'],
+    #     dicPosition['right_zero'],
+    #     dicPosition['right_zero'],  #'R', 'Y', 'J', 'A',
+    #     dicPosition['left_up'],
+    #     dicPosition['left_up'],
+    #     dicPosition['right_up'],
+    #     dicPosition['left_up'],  # 'U', 'C', 'M', 'F',
+    #     dicPosition['left_zero'],
+    #     dicPosition['right_up'],
+    #     dicPosition['right_down'],
+    #     dicPosition['down_zero'],  #'D', 'B', 'H', 'P'
+    #     dicPosition['left_up'],
+    #     dicPosition['up_zero'],
+    #     dicPosition['right_up'],
+    #     dicPosition['left_up'],  # 'E', 'X', 'N', 'T',
+    #     dicPosition['left_zero'],
+    #     dicPosition['right_zero'],
+    #     dicPosition['left_zero_long'],
+    #     dicPosition['left_zero_slight'],  # 'K', 'Q', 'V', 'I',
+    #     dicPosition['right_down'],
+    #     dicPosition['left_down'],
+    #     dicPosition['right_up'],
+    #     dicPosition['down_zero']
+    # ]  # 'L', 'S', 'G', 'O'
+    # for idx in range(len(labels)):
+    #     box = dict(boxstyle='round,pad=.5',facecolor='yellow',alpha=0.5)
+    #     ax.annotate(labels[idx],
+    #                 xy=(recall[idx],precision[idx]), xycoords='data',
+    #                 xytext=vecPositions[idx], textcoords='offset points',
+    #                 arrowprops=dict(arrowstyle="->", connectionstyle="arc3"),
+    #                 bbox=box)
+    ax.set_xlim([-0.1, 1.1])
+    ax.set_ylim([-0.1, 1.1])
+
+
+# Size (inches) and resolution of the saved graphs: matplotlib's defaults, fixed so that they do
+# not depend on the rc settings of the process saving them
+_SAVE_FIGSIZE = (6.4, 4.8)
+_SAVE_DPI = 100
+
+
+# Fields of a class result read by the plotting functions
+_PLOT_FIELDS = ('precision', 'recall', 'AP', 'interpolated precision', 'interpolated recall',
+                'method')
+
+
+def _agg_figure():
+    """ Create a standalone Figure of _SAVE_FIGSIZE rendered by the Agg canvas.
+
+        Unlike pyplot, it needs no GUI backend (so it can be used in worker processes), does not
+        change pyplot's current figure and is not kept alive by pyplot's figure manager.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    fig = Figure(figsize=_SAVE_FIGSIZE)
+    FigureCanvasAgg(fig)
+    return fig
+
+
+def _save_all_classes(results, mAP, showInterpolatedPrecision, savePath):
+    """ Save the curves of all classes to <savePath>/all_classes.png, on a new _agg_figure. """
+    fig = _agg_figure()
+    _draw_all_classes(fig.add_subplot(), results, mAP, showInterpolatedPrecision)
+    fig.savefig(os.path.join(savePath, 'all_classes.png'), dpi=_SAVE_DPI)
+
+
+def _save_class_curve(classId, result, showAP, showInterpolatedPrecision, savePath, fig=None):
+    """ Save the curve of a single class to <savePath>/<classId>.png.
+
+        The curve is drawn on fig, cleared first, or on a new _agg_figure if fig is None.
+    """
+    if fig is None:
+        fig = _agg_figure()
+    else:
+        fig.clf()
+    _draw_class_curve(fig.add_subplot(), classId, result, showAP, showInterpolatedPrecision)
+    fig.savefig(os.path.join(savePath, classId + '.png'), dpi=_SAVE_DPI)
+
+
 def plot_precision_recall_curves(results,
                                  showAP=False,
                                  showInterpolatedPrecision=False,
                                  savePath=None,
-                                 showGraphic=True):
+                                 showGraphic=True,
+                                 executor=None):
+    """ Plot the precision x recall curve of each class.
+
+        If an executor (e.g. a concurrent.futures.ProcessPoolExecutor) is given and the curves are
+        only saved (savePath is set and showGraphic is False), the classes are rendered in parallel
+        by the executor's workers.
+    """
     result = None
     # Each resut represents a class
     for classId, result in results.items():
         if result is None:
             raise IOError(f'Error: Class {classId} could not be found.')
 
-        precision = result['precision']
-        recall = result['recall']
-        average_precision = result['AP']
-        mpre = result['interpolated precision']
-        mrec = result['interpolated recall']
-        method = result['method']
+    if executor is not None and savePath is not None and showGraphic is False:
+        n = len(results)
+        list(
+            executor.map(_save_class_curve, results.keys(), results.values(), repeat(showAP, n),
+                         repeat(showInterpolatedPrecision, n), repeat(savePath, n)))
+        return results
+
+    if not showGraphic:
+        if savePath is not None:
+            # a single figure, cleared between the classes
+            fig = _agg_figure()
+            for classId, result in results.items():
+                _save_class_curve(classId, result, showAP, showInterpolatedPrecision, savePath,
+                                  fig)
+        return results
+
+    for classId, result in results.items():
         plt.close()
-        if showInterpolatedPrecision:
-            if method == MethodAveragePrecision.EVERY_POINT_INTERPOLATION:
-                plt.plot(mrec, mpre, '--r', label='Interpolated precision (every point)')
-            elif method == MethodAveragePrecision.ELEVEN_POINT_INTERPOLATION:
-                # Remove duplicates, getting only the highest precision of each recall value
-                nrec = []
-                nprec = []
-                for idx in range(len(mrec)):
-                    r = mrec[idx]
-                    if r not in nrec:
-                        idxEq = np.argwhere(mrec == r)
-                        nrec.append(r)
-                        nprec.append(max([mpre[int(id)] for id in idxEq]))
-                plt.plot(nrec, nprec, 'or', label='11-point interpolated precision')
-        plt.plot(recall, precision, label='Precision')
-        plt.xlabel('recall')
-        plt.ylabel('precision')
-        if showAP:
-            ap_str = "{0:.2f}%".format(average_precision * 100)
-            # ap_str = "{0:.4f}%".format(average_precision * 100)
-            plt.title('Precision x Recall curve \nClass: %s, AP: %s' % (str(classId), ap_str))
-        else:
-            plt.title('Precision x Recall curve \nClass: %s' % str(classId))
-        plt.legend(shadow=True)
-        plt.grid()
-        ############################################################
-        # Uncomment the following block to create plot with points #
-        ############################################################
-        # plt.plot(recall, precision, 'bo')
-        # labels = ['R', 'Y', 'J', 'A', 'U', 'C', 'M', 'F', 'D', 'B', 'H', 'P', 'E', 'X', 'N', 'T',
-        # 'K', 'Q', 'V', 'I', 'L', 'S', 'G', 'O']
-        # dicPosition = {}
-        # dicPosition['left_zero'] = (-30,0)
-        # dicPosition['left_zero_slight'] = (-30,-10)
-        # dicPosition['right_zero'] = (30,0)
-        # dicPosition['left_up'] = (-30,20)
-        # dicPosition['left_down'] = (-30,-25)
-        # dicPosition['right_up'] = (20,20)
-        # dicPosition['right_down'] = (20,-20)
-        # dicPosition['up_zero'] = (0,30)
-        # dicPosition['up_right'] = (0,30)
-        # dicPosition['left_zero_long'] = (-60,-2)
-        # dicPosition['down_zero'] = (-2,-30)
-        # vecPositions = [
-        #     dicPosition['left_down'],
-        #     dicPosition['left_zero'],
-        #     dicPosition['right_zero'],
-        #     dicPosition['right_zero'],  #'R', 'Y', 'J', 'A',
-        #     dicPosition['left_up'],
-        #     dicPosition['left_up'],
-        #     dicPosition['right_up'],
-        #     dicPosition['left_up'],  # 'U', 'C', 'M', 'F',
-        #     dicPosition['left_zero'],
-        #     dicPosition['right_up'],
-        #     dicPosition['right_down'],
-        #     dicPosition['down_zero'],  #'D', 'B', 'H', 'P'
-        #     dicPosition['left_up'],
-        #     dicPosition['up_zero'],
-        #     dicPosition['right_up'],
-        #     dicPosition['left_up'],  # 'E', 'X', 'N', 'T',
-        #     dicPosition['left_zero'],
-        #     dicPosition['right_zero'],
-        #     dicPosition['left_zero_long'],
-        #     dicPosition['left_zero_slight'],  # 'K', 'Q', 'V', 'I',
-        #     dicPosition['right_down'],
-        #     dicPosition['left_down'],
-        #     dicPosition['right_up'],
-        #     dicPosition['down_zero']
-        # ]  # 'L', 'S', 'G', 'O'
-        # for idx in range(len(labels)):
-        #     box = dict(boxstyle='round,pad=.5',facecolor='yellow',alpha=0.5)
-        #     plt.annotate(labels[idx],
-        #                 xy=(recall[idx],precision[idx]), xycoords='data',
-        #                 xytext=vecPositions[idx], textcoords='offset points',
-        #                 arrowprops=dict(arrowstyle="->", connectionstyle="arc3"),
-        #                 bbox=box)
-        plt.xlim([-0.1, 1.1])
-        plt.ylim([-0.1, 1.1])
+        _draw_class_curve(plt.gca(), classId, result, showAP, showInterpolatedPrecision)
         if savePath is not None:
             plt.savefig(os.path.join(savePath, classId + '.png'))
-        if showGraphic is True:
-            plt.show()
-            # plt.waitforbuttonpress()
-            plt.pause(0.05)
+        plt.show()
+        # plt.waitforbuttonpress()
+        plt.pause(0.05)
     return results
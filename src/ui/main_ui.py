@@ -1,10 +1,11 @@
 # -*- coding: utf-8 -*-
 
-# Form implementation generated from reading ui file 'main_ui.ui'
+# Form implementation generated from reading ui file 'src/ui/main_ui.ui'
 #
-# Created by: PyQt5 UI code generator 5.12.3
+# Created by: PyQt5 UI code generator 5.15.11
 #
-# WARNING! All changes made in this file will be lost!
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
 
 
 from PyQt5 import QtCore, QtGui, QtWidgets
@@ -19,9 +20,6 @@ class Ui_Dialog(object):
         self.btn_stats_gt = QtWidgets.QPushButton(Dialog)
         self.btn_stats_gt.setGeometry(QtCore.QRect(10, 265, 221, 27))
         self.btn_stats_gt.setObjectName("btn_stats_gt")
-        self.btn_clear_all = QtWidgets.QPushButton(Dialog)
-        self.btn_clear_all.setGeometry(QtCore.QRect(1080, 5, 120, 27))
-        self.btn_clear_all.setObjectName("btn_clear_all")
         self.btn_gt_images_dir = QtWidgets.QPushButton(Dialog)
         self.btn_gt_images_dir.setGeometry(QtCore.QRect(1170, 70, 31, 27))
         self.btn_gt_images_dir.setObjectName("btn_gt_images_dir")
@@ -86,6 +84,9 @@ class Ui_Dialog(object):
         self.lbl_groundtruth_dir_3.setFont(font)
         self.lbl_groundtruth_dir_3.setAlignment(QtCore.Qt.AlignCenter)
         self.lbl_groundtruth_dir_3.setObjectName("lbl_groundtruth_dir_3")
+        self.btn_clear_all = QtWidgets.QPushButton(Dialog)
+        self.btn_clear_all.setGeometry(QtCore.QRect(1080, 5, 120, 27))
+        self.btn_clear_all.setObjectName("btn_clear_all")
         self.lbl_groundtruth_dir_2 = QtWidgets.QLabel(Dialog)
         self.lbl_groundtruth_dir_2.setGeometry(QtCore.QRect(10, 75, 101, 17))
         self.lbl_groundtruth_dir_2.setObjectName("lbl_groundtruth_dir_2")
@@ -427,7 +428,6 @@ class Ui_Dialog(object):
         font.setWeight(75)
         self.btn_run.setFont(font)
         self.btn_run.setObjectName("btn_run")
-        self.btn_run.setShortcut(QtGui.QKeySequence("Ctrl+Return"))
         self.lbl_groundtruth_dir_24 = QtWidgets.QLabel(Dialog)
         self.lbl_groundtruth_dir_24.setGeometry(QtCore.QRect(10, 370, 101, 17))
         self.lbl_groundtruth_dir_24.setObjectName("lbl_groundtruth_dir_24")
@@ -468,16 +468,16 @@ class Ui_Dialog(object):
         self.lbl_groundtruth_dir_28.setObjectName("lbl_groundtruth_dir_28")
 
         self.retranslateUi(Dialog)
-        self.btn_gt_dir.clicked.connect(Dialog.btn_gt_dir_clicked)
-        self.btn_gt_images_dir.clicked.connect(Dialog.btn_gt_images_dir_clicked)
-        self.btn_stats_det.clicked.connect(Dialog.btn_statistics_det_clicked)
-        self.btn_stats_gt.clicked.connect(Dialog.btn_gt_statistics_clicked)
-        self.btn_groundtruth_dir_5.clicked.connect(Dialog.btn_gt_classes_clicked)
-        self.btn_groundtruth_dir_3.clicked.connect(Dialog.btn_det_dir_clicked)
-        self.btn_groundtruth_dir_4.clicked.connect(Dialog.btn_det_classes_clicked)
-        self.btn_run.clicked.connect(Dialog.btn_run_clicked)
-        self.btn_clear_all.clicked.connect(Dialog.btn_clear_all_clicked)
-        self.btn_output_dir.clicked.connect(Dialog.btn_output_dir_clicked)
+        self.btn_gt_dir.clicked.connect(Dialog.btn_gt_dir_clicked) # type: ignore
+        self.btn_gt_images_dir.clicked.connect(Dialog.btn_gt_images_dir_clicked) # type: ignore
+        self.btn_stats_det.clicked.connect(Dialog.btn_statistics_det_clicked) # type: ignore
+        self.btn_stats_gt.clicked.connect(Dialog.btn_gt_statistics_clicked) # type: ignore
+        self.btn_groundtruth_dir_5.clicked.connect(Dialog.btn_gt_classes_clicked) # type: ignore
+        self.btn_groundtruth_dir_3.clicked.connect(Dialog.btn_det_dir_clicked) # type: ignore
+        self.btn_groundtruth_dir_4.clicked.connect(Dialog.btn_det_classes_clicked) # type: ignore
+        self.btn_run.clicked.connect(Dialog.btn_run_clicked) # type: ignore
+        self.btn_output_dir.clicked.connect(Dialog.btn_output_dir_clicked) # type: ignore
+        self.btn_clear_all.clicked.connect(Dialog.btn_clear_all_clicked) # type: ignore
         QtCore.QMetaObject.connectSlotsByName(Dialog)
         Dialog.setTabOrder(self.txb_gt_dir, self.btn_gt_dir)
         Dialog.setTabOrder(self.btn_gt_dir, self.txb_gt_images_dir)
@@ -500,8 +500,6 @@ class Ui_Dialog(object):
         Dialog.setWindowTitle(_translate("Dialog", "Object Detection Metrics"))
         self.btn_stats_gt.setToolTip(_translate("Dialog", "The configurations will be applied in a random ground truth image."))
         self.btn_stats_gt.setText(_translate("Dialog", "show ground-truth statistics"))
-        self.btn_clear_all.setToolTip(_translate("Dialog", "Reset every text box, radio button, check box and spin box back to its original default state."))
-        self.btn_clear_all.setText(_translate("Dialog", "Clear All"))
         self.btn_gt_images_dir.setText(_translate("Dialog", "..."))
         self.btn_gt_dir.setText(_translate("Dialog", "..."))
         self.rad_gt_format_coco_json.setText(_translate("Dialog", "COCO (.json)"))
@@ -517,6 +515,8 @@ class Ui_Dialog(object):
         self.rad_gt_format_cvat_xml.setToolTip(_translate("Dialog", "<html><head/><body><p><span style=\" font-weight:600;\">Format:</span> A unique XML file containing all detections of the dataset in the CVAT format as described at <a href=\"https://github.com/openvinotoolkit/cvat/blob/7512fd6883829ff2692ef42a5a41a06f3805da14/cvat/apps/documentation/xml_format.md\"><span style=\" text-decoration: underline; color:#0000ff;\">https://github.com/openvinotoolkit/cvat/blob/7512fd6883829ff2692ef42a5a41a06f3805da14/cvat/apps/documentation/xml_format.md</span></a>"))
         self.rad_gt_format_cvat_xml.setText(_translate("Dialog", "CVAT format (.xml)"))
         self.lbl_groundtruth_dir_3.setText(_translate("Dialog", "Ground truth"))
+        self.btn_clear_all.setToolTip(_translate("Dialog", "Reset every text box, radio button, check box and spin box back to its original default state."))
+        self.btn_clear_all.setText(_translate("Dialog", "Clear All"))
         self.lbl_groundtruth_dir_2.setText(_translate("Dialog", "Images:"))
         self.lbl_groundtruth_dir.setText(_translate("Dialog", "Annotations:"))
         self.lbl_groundtruth_dir_22.setText(_translate("Dialog", "Detections"))
@@ -562,13 +562,3 @@ class Ui_Dialog(object):
         self.btn_output_dir.setText(_translate("Dialog", "..."))
         self.lbl_groundtruth_dir_29.setText(_translate("Dialog", "* required for formats with <class_id> only."))
         self.lbl_groundtruth_dir_28.setText(_translate("Dialog", "Output:"))
-
-
-if __name__ == "__main__":
-    import sys
-    app = QtWidgets.QApplication(sys.argv)
-    Dialog = QtWidgets.QDialog()
-    ui = Ui_Dialog()
-    ui.setupUi(Dialog)
-    Dialog.show()
-    sys.exit(app.exec_())
@@ -0,0 +1,169 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from PyQt5 import QtCore
+
+_executor = None
+
+
+def get_executor():
+    """ Return the process pool shared by every evaluation, creating it on first use.
+
+        Processes are started with 'spawn': forking a process that runs a Qt event loop is not
+        safe. The pool is kept for the lifetime of the application, so the interpreter start-up
+        cost is only paid on the first run. It has one worker per CPU (at least two, one for each
+        evaluator) so it can also render the per-class plots in parallel.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=max(2, os.cpu_count() or 1),
+                                        mp_context=multiprocessing.get_context('spawn'))
+    return _executor
+
+
+def _discard_executor():
+    """ Shut the shared pool down without waiting and forget it, so the next get_executor call
+        creates a new one.
+
+        Called when a worker died (e.g. killed for running out of memory): the pool is then broken
+        and every later submission would fail.
+    """
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+        _executor = None
+
+
+def compute_metrics(gt_annotations,
+                    det_annotations,
+                    coco=True,
+                    iou_threshold=None,
+                    generate_table=True):
+    """ Evaluate the COCO and PASCAL VOC metrics in parallel, one process each.
+
+    Parameters
+    ----------
+        gt_annotations : list or BoundingBoxes
+            Ground-truth bounding boxes.
+        det_annotations : list or BoundingBoxes
+            Detected bounding boxes.
+        coco : bool
+            Whether the COCO summary has to be computed.
+        iou_threshold : float (optional)
+            IOU threshold of the PASCAL VOC metrics. If None, they are not computed.
+        generate_table : bool
+            Whether the PASCAL VOC per-class tables are built. They are only needed when the
+            per-class results are kept.
+
+    Returns:
+        tuple: (coco_res, pascal_res), the dictionaries returned by get_coco_summary and
+        get_pascalvoc_metrics, or empty dictionaries for the metrics not computed.
+    """
+    from src.bounding_boxes import BoundingBoxes
+    from src.evaluators.coco_evaluator import get_coco_summary
+    from src.evaluators.pascal_voc_evaluator import get_pascalvoc_metrics
+    # Convert the boxes to arrays once, for both evaluators, rather than in each process
+    gt_annotations = BoundingBoxes.of(gt_annotations)
+    det_annotations = BoundingBoxes.of(det_annotations,
+                                       image_index=gt_annotations.image_index,
+                                       class_index=gt_annotations.class_index)
+    # Sort the detections here, so both evaluators receive the order with them
+    det_annotations.score_order
+    # Only the arrays are sent to the processes; pickling the BoundingBox objects would cost
+    # more than the conversion saved
+    gt_annotations = gt_annotations.arrays_only()
+    det_annotations = det_annotations.arrays_only()
+    executor = get_executor()
+    coco_future = pascal_future = None
+    try:
+        if coco:
+            coco_future = executor.submit(get_coco_summary, gt_annotations, det_annotations)
+        if iou_threshold is not None:
+            pascal_future = executor.submit(get_pascalvoc_metrics,
+                                            gt_annotations,
+                                            det_annotations,
+                                            iou_threshold=iou_threshold,
+                                            generate_table=generate_table)
+        coco_res = {} if coco_future is None else coco_future.result()
+        pascal_res = {} if pascal_future is None else pascal_future.result()
+    except BrokenProcessPool:
+        _discard_executor()
+        raise
+    return coco_res, pascal_res
+
+
+def save_pr_curves(pascal_res, save_path):
+    """ Save the PASCAL VOC precision x recall graphs: all_classes.png and one per class.
+
+        The graphs are drawn on standalone Agg figures by the process pool, so this can run
+        outside the GUI thread: all_classes.png is rendered by one worker while the others render
+        the per-class graphs. Only the fields the graphs read are sent to the workers (not the
+        per-class tables).
+
+    Parameters
+    ----------
+        pascal_res : dict
+            Dictionary returned by get_pascalvoc_metrics.
+        save_path : str
+            Directory where the images are saved.
+    """
+    from src.evaluators.pascal_voc_evaluator import (_PLOT_FIELDS, _save_all_classes,
+                                                     plot_precision_recall_curves)
+    # Plain dictionaries with the plotted fields, cheap to pickle
+    per_class = {
+        class_id: {k: result[k] for k in _PLOT_FIELDS}
+        for class_id, result in pascal_res['per_class'].items()
+    }
+    executor = get_executor()
+    try:
+        # Save a single plot with all classes, next to the per-class ones
+        all_classes = executor.submit(_save_all_classes, per_class, pascal_res['mAP'], False,
+                                      save_path)
+        # Save plots for each class
+        plot_precision_recall_curves(per_class,
+                                     showAP=True,
+                                     savePath=save_path,
+                                     showGraphic=False,
+                                     executor=executor)
+        all_classes.result()
+    except BrokenProcessPool:
+        _discard_executor()
+        raise
+
+
+class MetricsWorker(QtCore.QThread):
+    """ Thread running compute_metrics, so the GUI keeps responding during the evaluation.
+
+        If plots_dir is given, the PASCAL VOC graphs are also saved there (see save_pr_curves)
+        before the results are delivered.
+
+        The results are delivered through the metrics_ready signal, which Qt queues to the
+        thread that owns the receiver (the GUI thread). Any exception is reported as a message
+        through the failed signal.
+    """
+    metrics_ready = QtCore.pyqtSignal(object, object)
+    failed = QtCore.pyqtSignal(str)
+
+    def __init__(self,
+                 gt_annotations,
+                 det_annotations,
+                 coco,
+                 iou_threshold,
+                 generate_table=True,
+                 plots_dir=None,
+                 parent=None):
+        QtCore.QThread.__init__(self, parent)
+        self._args = (gt_annotations, det_annotations, coco, iou_threshold, generate_table)
+        self._plots_dir = plots_dir
+
+    def run(self):
+        try:
+            coco_res, pascal_res = compute_metrics(*self._args)
+            if self._plots_dir is not None and len(pascal_res) != 0:
+                save_pr_curves(pascal_res, self._plots_dir)
+        except Exception as e:
+            self.failed.emit(f'{type(e).__name__}: {e}')
+            return
+        self.metrics_ready.emit(coco_res, pascal_res)
@@ -18,9 +18,13 @@ User-facing additions implemented in this file
       state the dialog has immediately after launch.
 
 * **Blue background**
-      A light-blue window background (``#cfe8ff``) applied through a
-      Qt stylesheet so the colour renders consistently across
-      desktop themes and platforms.
+      A light-blue window background (``#cfe8ff``) applied through the
+      window palette, so no Qt stylesheet has to be parsed at start-up.
+
+* **Background evaluation**
+      RUN evaluates the metrics and saves the precision x recall graphs
+      in a worker thread (see :mod:`src.ui.metrics_worker`) behind a
+      progress dialog, so the window keeps repainting meanwhile.
 
 * **Keyboard shortcuts**
       ===============  ==========================================
@@ -31,26 +35,27 @@ User-facing additions implemented in this file
       ===============  ==========================================
 
 All customisations live in :class:`Main_Dialog` so the generated
-``main_ui.py`` can be regenerated from ``main_ui.ui`` without
-losing behaviour.
+``main_ui.py`` can be regenerated from ``main_ui.ui`` (``make ui``)
+without losing behaviour.  The form is compiled ahead of time and
+imported as a plain module; nothing is parsed from ``.ui`` XML at
+start-up.
 """
 
+import functools
 import os
+import time
 
-import src.utils.converter as converter
-import src.utils.general_utils as general_utils
 from PyQt5 import QtCore, QtGui, QtWidgets
-from PyQt5.QtWidgets import QFileDialog, QMainWindow, QMessageBox, QShortcut
+from PyQt5.QtWidgets import QFileDialog, QMainWindow, QMessageBox
 from PyQt5.QtGui import QKeySequence
-from src.evaluators.coco_evaluator import get_coco_summary
-from src.evaluators.pascal_voc_evaluator import (get_pascalvoc_metrics, plot_precision_recall_curve,
-                                                 plot_precision_recall_curves)
-from src.ui.details import Details_Dialog
 from src.ui.main_ui import Ui_Dialog as Main_UI
-from src.ui.results import Results_Dialog
 from src.ui.splash import Splash_Dialog
 from src.utils.enumerators import BBFormat, BBType, CoordinatesType
 
+# The evaluators, converters and secondary dialogs pull in numpy, pandas,
+# matplotlib and OpenCV.  They are imported inside the methods that use
+# them so the main window can be shown before those libraries load.
+
 
 # ---------------------------------------------------------------------------
 # Visual / interaction constants
@@ -62,19 +67,118 @@ from src.utils.enumerators import BBFormat, BBType, CoordinatesType
 #: system grey.
 WINDOW_BACKGROUND_COLOR = "#cfe8ff"
 
-#: Geometry of the **Clear All** button expressed as (x, y, width, height)
-#: in pixels within the fixed-size 1214x850 main dialog.  The position
-#: ``(1080, 5)`` places the button in the top-right corner, aligned with
-#: the "Ground truth" section header, without overlapping any existing
-#: control.
-CLEAR_ALL_BUTTON_GEOMETRY = (1080, 5, 120, 27)
-
 #: Default value for the Pascal VOC IOU-threshold spin box.  Mirrors the
 #: value baked into the Designer (.ui) file so :meth:`Main_Dialog.
 #: btn_clear_all_clicked` can restore it symbolically rather than with a
 #: magic number.
 DEFAULT_IOU_THRESHOLD = 0.5
 
+#: Number of (detection, ground truth) IOU pairs above which RUN asks for
+#: confirmation before evaluating.  Around this size the evaluation takes
+#: minutes, and the window would otherwise just show the progress dialog.
+IOU_PAIRS_CONFIRM_THRESHOLD = 10**8
+
+#: Tooltip of the **RUN** button, including its keyboard shortcut.  Set
+#: as a whole: the Designer file only carries a placeholder text.
+_RUN_TOOLTIP = "Compute the selected metrics (shortcut: Ctrl+Enter)."
+
+#: Directory containing this module, used as the starting folder of the
+#: file dialogs.  Resolved once at import: ``realpath`` stats every path
+#: component and the result cannot change during the process lifetime.
+_MODULE_DIR = os.path.dirname(os.path.realpath(__file__))
+
+#: Extensions accepted as dataset images, already in the lowercase
+#: ``'.ext'`` form :func:`general_utils.iter_files_dir` compares names with.
+_IMAGE_EXTS = frozenset({'.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.tif'})
+
+#: Seconds a directory check (:meth:`Main_Dialog._isdir`) or a path
+#: fingerprint (:meth:`Main_Dialog._signature`) is reused.  Long enough to
+#: cover the repeated probes of a single click, short enough that a change
+#: on disk meanwhile is noticed on the next one.
+_PATH_CHECK_TTL = 1.0
+
+
+@functools.lru_cache(maxsize=8)
+def _has_image_files(dir_path, mtime_ns):
+    """
+    Tell whether ``dir_path`` contains at least one image file.
+
+    Stops at the first image instead of listing the whole directory.
+    ``mtime_ns`` (the directory's ``st_mtime_ns``) is not used in the body;
+    it is part of the cache key, so adding, removing or renaming a file
+    in the directory invalidates the cached answer.
+    """
+    import src.utils.general_utils as general_utils
+    files = general_utils.iter_files_dir(dir_path, extensions=_IMAGE_EXTS)
+    try:
+        return next(files, None) is not None
+    finally:
+        # Close the directory now rather than when the generator is collected
+        files.close()
+
+
+@functools.lru_cache(maxsize=4)
+def _read_classes(filepath, mtime_ns):
+    """
+    Return the classes listed in ``filepath``, as read by
+    :func:`general_utils.get_classes_from_txt_file`.
+
+    ``mtime_ns`` (the file's ``st_mtime_ns``) is only part of the cache
+    key, so editing the file invalidates the cached classes.  The returned
+    dictionary is shared: callers must not modify it.
+    """
+    import src.utils.general_utils as general_utils
+    return general_utils.get_classes_from_txt_file(filepath)
+
+
+def _path_signature(path):
+    """
+    Fingerprint a file, or every file under a directory, by name,
+    modification time and size.
+
+    Part of the annotation cache keys: editing, adding, removing or
+    renaming a file changes the signature.  ``None`` if ``path`` is unset
+    or does not exist.  Files that cannot be stat'ed (dangling symlinks,
+    files deleted during the walk) are left out, as the loaders cannot
+    read them either; this runs inside slots, where an exception would
+    abort the application.
+    """
+    if path is None or not os.path.exists(path):
+        return None
+    if os.path.isfile(path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+    entries = []
+    for root, _, files in os.walk(path):
+        for f in files:
+            file_path = os.path.join(root, f)
+            try:
+                st = os.stat(file_path)
+            except OSError:
+                continue
+            entries.append((file_path, st.st_mtime_ns, st.st_size))
+    return tuple(sorted(entries))
+
+
+@functools.lru_cache(maxsize=None)
+def _quit_sequences():
+    """
+    Return the key sequences that quit the application: the platform
+    bindings of :data:`QKeySequence.Quit` plus ``Ctrl+Q`` if missing.
+
+    The platform mapping cannot change within a process, so it is resolved
+    once.  It is resolved on first call rather than at import because the
+    platform key bindings are only available once a ``QApplication`` exists.
+    """
+    sequences = QKeySequence.keyBindings(QKeySequence.Quit)
+    ctrl_q = QKeySequence("Ctrl+Q")
+    if ctrl_q not in sequences:
+        sequences.append(ctrl_q)
+    return tuple(sequences)
+
 
 class Main_Dialog(QMainWindow, Main_UI):
     """
@@ -118,22 +222,43 @@ class Main_Dialog(QMainWindow, Main_UI):
         customisations in a fixed, easy-to-audit order:
 
         1. :meth:`_apply_background_style`    - paint the window blue.
-        2. :meth:`_install_clear_all_button`  - add / wire the reset button.
-        3. :meth:`_install_run_shortcut`      - bind ``Ctrl+Enter`` to RUN.
-        4. :meth:`_install_quit_shortcut`     - bind ``Ctrl+Q`` to quit.
+        2. :meth:`_cache_reset_groups`        - collect the widgets Clear All
+                                                resets.
+        3. :meth:`_install_format_groups`     - group the format radios.
+        4. :meth:`_install_run_shortcut`      - bind ``Ctrl+Enter`` to RUN.
+        5. :meth:`_install_quit_shortcut`     - bind ``Ctrl+Q`` to quit.
+
+        The **Clear All** button itself is created and connected by
+        :meth:`setupUi`.
 
         Splitting the work into helpers keeps each concern self-contained
         and individually testable.
         """
         QMainWindow.__init__(self)
         self.setupUi(self)
-        self.current_directory = os.path.dirname(os.path.realpath(__file__))
-        # Define error msg dialog
-        self.msgBox = QMessageBox()
-        # Define details dialog
-        self.dialog_statistics = Details_Dialog()
-        # Define results dialog
-        self.dialog_results = Results_Dialog()
+        self.current_directory = _MODULE_DIR
+        # Message box, details and results dialogs are built on first use
+        # (see the ``msgBox``, ``dialog_statistics`` and ``dialog_results``
+        # properties)
+        self._msgbox = None
+        self._close_confirm_box = None
+        self._dialog_statistics = None
+        self._dialog_results = None
+        # Thread evaluating the metrics of the current RUN (None when idle)
+        self._metrics_worker = None
+        # Format radio button -> annotation loader tables (built on first use)
+        self._gt_dispatch = None
+        self._det_dispatch = None
+        # 'gt' / 'det' -> (key, annotations) of the last load (see _load_cached)
+        self._annotations_cache = {}
+        # (check, path) -> (time.monotonic() of the check, result) (see _path_check)
+        self._path_check_cache = {}
+        # path -> (time.monotonic() of the walk, signature) (see _signature)
+        self._signature_cache = {}
+        # Set by _install_run_shortcut once its action is registered
+        self._run_shortcut_installed = False
+        # Set by _install_quit_shortcut once its action is registered
+        self._quit_shortcut_installed = False
 
         # Default values
         self.dir_annotations_gt = None
@@ -145,12 +270,71 @@ class Main_Dialog(QMainWindow, Main_UI):
 
         # ---- Runtime UI customisations (order matters only for z-stacking) ----
         self._apply_background_style()
-        self._install_clear_all_button()
+        self._cache_reset_groups()
+        self._install_format_groups()
         self._install_run_shortcut()
         self._install_quit_shortcut()
 
         self.center_screen()
 
+    # ------------------------------------------------------------------ #
+    #  Lazily constructed secondary dialogs                              #
+    # ------------------------------------------------------------------ #
+
+    @property
+    def msgBox(self):
+        """
+        :class:`QMessageBox` reused by :meth:`show_popup`.
+
+        Built on first access: constructing a message box allocates
+        platform dialog resources that most launches never need.  It is
+        parented to the window so it is centred over it and owned by it.
+        """
+        if self._msgbox is None:
+            self._msgbox = QMessageBox(self)
+        return self._msgbox
+
+    @property
+    def close_confirm_box(self):
+        """
+        Dedicated Yes/No :class:`QMessageBox` asked by :meth:`closeEvent`.
+
+        Its text, icon and buttons never change, so they are set once when
+        the box is first built instead of on every close attempt.
+        """
+        if self._close_confirm_box is None:
+            self._close_confirm_box = QMessageBox(QMessageBox.Question, 'Closing',
+                                                  'Are you sure you want to close the program?',
+                                                  QMessageBox.Yes | QMessageBox.No, self)
+        return self._close_confirm_box
+
+    @property
+    def dialog_statistics(self):
+        """
+        :class:`Details_Dialog` used by both *statistics* buttons.
+
+        Built on first access rather than in :meth:`__init__`: many
+        sessions never open it, and its ``setupUi`` would otherwise sit on
+        the main window's start-up path.
+        """
+        if self._dialog_statistics is None:
+            from src.ui.details import Details_Dialog
+            self._dialog_statistics = Details_Dialog()
+        return self._dialog_statistics
+
+    @property
+    def dialog_results(self):
+        """
+        :class:`Results_Dialog` shown after a successful **RUN**.
+
+        Built on first access for the same reason as
+        :attr:`dialog_statistics`.
+        """
+        if self._dialog_results is None:
+            from src.ui.results import Results_Dialog
+            self._dialog_results = Results_Dialog()
+        return self._dialog_results
+
     # ------------------------------------------------------------------ #
     #  Private setup helpers                                             #
     # ------------------------------------------------------------------ #
@@ -161,123 +345,123 @@ class Main_Dialog(QMainWindow, Main_UI):
 
         Implementation detail
         ~~~~~~~~~~~~~~~~~~~~~
-        When ``setupUi`` is called on a :class:`QMainWindow`, the Designer
-        widgets end up parented to an implicitly created *central widget*,
-        not to the main window itself.  Applying a stylesheet only to the
-        ``QMainWindow`` can therefore be masked by that central widget on
-        some Qt styles.  To guarantee a consistent look we:
-
-        1. Set a selector-scoped stylesheet on the main window so only the
-           window surface is affected (child widgets such as line edits
-           keep their own backgrounds).
-        2. Additionally style the central widget directly.
-        3. Fall back to a :class:`QPalette` paint in the unlikely event
-           that no central widget exists.
-        """
-        css = "background-color: %s;" % WINDOW_BACKGROUND_COLOR
-
-        # Selector limits the rule to the QMainWindow surface; without it
-        # every descendant (QLineEdit, QPushButton, ...) would inherit the
-        # blue background, which is visually noisy.
-        self.setStyleSheet("QMainWindow { %s }" % css)
-
-        central = self.centralWidget()
-        if central is not None:
-            central.setStyleSheet(css)
-        else:
-            # Defensive branch: setupUi normally provides a central
-            # widget, but if a future refactor removes it we still want a
-            # blue window rather than silently reverting to system grey.
-            palette = self.palette()
-            palette.setColor(QtGui.QPalette.Window,
-                             QtGui.QColor(WINDOW_BACKGROUND_COLOR))
-            self.setPalette(palette)
-            self.setAutoFillBackground(True)
-
-    def _install_clear_all_button(self):
-        """
-        Ensure a **Clear All** push button exists and is wired up.
-
-        Two creation paths are supported:
-
-        * **Designer path** - ``main_ui.py`` (regenerated from
-          ``main_ui.ui``) already creates ``btn_clear_all`` and connects
-          its ``clicked`` signal to :meth:`btn_clear_all_clicked`.  In
-          this case we only raise the button to the top of the z-order
-          so it is not hidden behind the wide header label.
-
-        * **Fallback path** - an older or stale ``main_ui.py`` may not
-          yet contain the button.  We create and connect it here so the
-          feature is still available.  Connecting only on this path
-          prevents a *double* signal-slot connection (which would make
-          the reset handler run twice per click).
-        """
-        if not hasattr(self, "btn_clear_all") or self.btn_clear_all is None:
-            # -- Fallback path: create the widget ourselves --------------
-            parent = self.centralWidget() if self.centralWidget() is not None else self
-            self.btn_clear_all = QtWidgets.QPushButton(parent)
-            self.btn_clear_all.setGeometry(
-                QtCore.QRect(*CLEAR_ALL_BUTTON_GEOMETRY))
-            self.btn_clear_all.setObjectName("btn_clear_all")
-            self.btn_clear_all.setText("Clear All")
-            self.btn_clear_all.setToolTip(
-                "Reset every text box, radio button, check box and the "
-                "IOU spin box to the values they had on application "
-                "start-up.")
-            # Wire the click handler.  Done only on the fallback path to
-            # avoid double-connecting when the Designer code already did.
-            self.btn_clear_all.clicked.connect(self.btn_clear_all_clicked)
-
-        # The "Ground truth" header label spans the full window width at
-        # y=10.  Raise the button so it is drawn *above* the label rather
-        # than clipped behind it.
-        self.btn_clear_all.raise_()
+        ``setupUi`` parents the Designer widgets directly to the window (the
+        form defines no central widget), so setting the ``Window`` role of
+        the window palette is enough to colour the whole surface.  A
+        palette is used instead of a stylesheet because it needs no QSS
+        parsing or style re-polish of the widget tree; child widgets such
+        as line edits paint with their own palette roles and keep their
+        backgrounds.  A top-level window always fills its background, so
+        ``autoFillBackground`` does not need to be set as well.
+        """
+        palette = self.palette()
+        palette.setColor(QtGui.QPalette.Window, QtGui.QColor(WINDOW_BACKGROUND_COLOR))
+        self.setPalette(palette)
+
+    def _cache_reset_groups(self):
+        """
+        Collect, once, the widget groups that :meth:`btn_clear_all_clicked`
+        iterates over, so each click walks a prebuilt tuple instead of
+        resolving every widget attribute again.
+        """
+        self._line_edits = (self.txb_gt_dir,
+                            self.txb_gt_images_dir,
+                            self.txb_classes_gt,
+                            self.txb_det_dir,
+                            self.txb_classes_det,
+                            self.txb_output_dir)
+        # (result key, check box) pairs; the keys are the ones returned by
+        # get_coco_summary and get_pascalvoc_metrics
+        self._coco_metrics = (('AP', self.chb_metric_AP_coco),
+                              ('AP50', self.chb_metric_AP50_coco),
+                              ('AP75', self.chb_metric_AP75_coco),
+                              ('APsmall', self.chb_metric_APsmall_coco),
+                              ('APmedium', self.chb_metric_APmedium_coco),
+                              ('APlarge', self.chb_metric_APlarge_coco),
+                              ('AR1', self.chb_metric_AR_max1),
+                              ('AR10', self.chb_metric_AR_max10),
+                              ('AR100', self.chb_metric_AR_max100),
+                              ('ARsmall', self.chb_metric_AR_small),
+                              ('ARmedium', self.chb_metric_AR_medium),
+                              ('ARlarge', self.chb_metric_AR_large))
+        self._pascal_metrics = (('per_class', self.chb_metric_AP_pascal),
+                                ('mAP', self.chb_metric_mAP_pascal))
+        self._metric_checkboxes = tuple(cb for _, cb in self._coco_metrics + self._pascal_metrics)
+        # Every control whose state Clear All sets programmatically; their
+        # signals are blocked for the duration of the reset.
+        self._format_radios = (tuple(self.frame.findChildren(QtWidgets.QRadioButton)) +
+                               tuple(self.frame_4.findChildren(QtWidgets.QRadioButton)))
+        self._silent_reset_widgets = (self._format_radios + self._metric_checkboxes +
+                                      (self.dsb_IOU_pascal, ))
+
+    def _install_format_groups(self):
+        """
+        Put the ground-truth and the detection format radios in one
+        :class:`QButtonGroup` each so the selected format is read with one
+        ``checkedButton()`` call instead of polling ``isChecked()`` on each
+        radio, and record which formats need the image directory or the
+        class list.
+        """
+        self.gt_button_group = QtWidgets.QButtonGroup(self)
+        for rb in self.frame.findChildren(QtWidgets.QRadioButton):
+            self.gt_button_group.addButton(rb)
+        self.det_button_group = QtWidgets.QButtonGroup(self)
+        for rb in self.frame_4.findChildren(QtWidgets.QRadioButton):
+            self.det_button_group.addButton(rb)
+        # Relative coordinates are converted with the image sizes
+        self._det_relative_formats = frozenset(
+            (self.rad_det_ci_format_text_yolo_rel, self.rad_det_cn_format_text_yolo_rel))
+        # <class_id> formats need the text file mapping ids to class names
+        self._det_class_id_formats = frozenset(
+            (self.rad_det_ci_format_text_yolo_rel, self.rad_det_ci_format_text_xyx2y2_abs,
+             self.rad_det_ci_format_text_xywh_abs))
+
+    def _current_gt_format(self):
+        """Return the radio button of the selected ground-truth format."""
+        return self.gt_button_group.checkedButton()
+
+    def _current_det_format(self):
+        """Return the radio button of the selected detection format."""
+        return self.det_button_group.checkedButton()
 
     def _install_run_shortcut(self):
         """
         Bind ``Ctrl+Enter`` to the **RUN** button.
 
-        Why three bindings?
-        ~~~~~~~~~~~~~~~~~~~
-        * :meth:`QPushButton.setShortcut` gives Qt a chance to surface the
-          accelerator through native means (e.g. underline hints,
-          accessibility APIs).  This only responds to the *Return* key.
+        Why one action with two key sequences?
+        ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+        * Qt treats the main-keyboard *Enter* key (``Ctrl+Return``) and
+          the numeric-keypad key (``Ctrl+Enter``) as distinct key codes,
+          so both sequences are registered.
 
-        * A button-level shortcut is swallowed when keyboard focus sits
-          inside certain child widgets.  Two additional :class:`QShortcut`
-          objects with :data:`~QtCore.Qt.WindowShortcut` scope therefore
-          provide a reliable, focus-independent trigger.
+        * A single :class:`QAction` added to the window carries both
+          sequences, so Qt's shortcut map holds one entry for RUN instead
+          of one object per key.  Its :data:`~QtCore.Qt.WindowShortcut`
+          scope keeps the shortcut working wherever keyboard focus sits
+          inside the window.
 
-        * The two window-level shortcuts cover *both* physical Enter keys:
-          ``Ctrl+Return`` for the main-keyboard key and ``Ctrl+Enter`` for
-          the numeric-keypad key.  Qt treats them as distinct key codes,
-          so two separate bindings are required.
+        * No button-level accelerator is set: a second binding of
+          ``Ctrl+Return`` in the same window makes Qt treat the key as
+          ambiguous and trigger neither binding.
 
-        All routes converge on :meth:`QPushButton.click`, which emits the
+        The action converges on :meth:`QPushButton.click`, which emits the
         button's ``clicked`` signal exactly as a mouse press would -
         including the visual pressed-state animation.
         """
-        # Append a visible hint to the existing tooltip (only once - guard
-        # against repeated calls during unit tests).
-        hint = " (shortcut: Ctrl+Enter)"
-        tooltip = self.btn_run.toolTip() or ""
-        if hint.strip() not in tooltip:
-            self.btn_run.setToolTip(tooltip + hint)
-
-        # (1) Native button accelerator.
-        self.btn_run.setShortcut(QKeySequence("Ctrl+Return"))
-
-        # (2) Window-scope shortcut for the main-keyboard Enter key.
-        self._run_shortcut_return = QShortcut(
-            QKeySequence("Ctrl+Return"), self)
-        self._run_shortcut_return.setContext(QtCore.Qt.WindowShortcut)
-        self._run_shortcut_return.activated.connect(self.btn_run.click)
+        # Install only once - guard against repeated calls during unit
+        # tests, which would register the keys a second time, making them
+        # ambiguous.
+        if self._run_shortcut_installed:
+            return
+        self.btn_run.setToolTip(_RUN_TOOLTIP)
 
-        # (3) Window-scope shortcut for the numeric-keypad Enter key.
-        self._run_shortcut_enter = QShortcut(
-            QKeySequence("Ctrl+Enter"), self)
-        self._run_shortcut_enter.setContext(QtCore.Qt.WindowShortcut)
-        self._run_shortcut_enter.activated.connect(self.btn_run.click)
+        self._run_action = QtWidgets.QAction(self)
+        self._run_action.setShortcuts([QKeySequence("Ctrl+Return"),
+                                       QKeySequence("Ctrl+Enter")])
+        self._run_action.setShortcutContext(QtCore.Qt.WindowShortcut)
+        self._run_action.triggered.connect(self.btn_run.click)
+        self.addAction(self._run_action)
+        self._run_shortcut_installed = True
 
     def _install_quit_shortcut(self):
         """
@@ -289,33 +473,29 @@ class Main_Dialog(QMainWindow, Main_UI):
         honours their Yes / No answer, so ``Ctrl+Q`` enjoys the exact same
         safety net as clicking the window-manager close button.
 
-        :data:`QKeySequence.Quit` is used instead of a hard-coded string so
-        macOS users automatically get the idiomatic ``Cmd+Q`` mapping;
-        Linux and Windows resolve it to ``Ctrl+Q``.
+        The platform bindings of :data:`QKeySequence.Quit` are registered
+        so macOS users automatically get the idiomatic ``Cmd+Q`` mapping.
+        Some Qt builds on Windows / Linux leave that list empty, so a
+        literal ``Ctrl+Q`` is added whenever it is missing; both live on a
+        single :class:`QAction`.  The list is built once per process by
+        :func:`_quit_sequences`.
         """
-        self._quit_shortcut = QShortcut(
-            QKeySequence(QKeySequence.Quit), self)
-        self._quit_shortcut.setContext(QtCore.Qt.WindowShortcut)
-        self._quit_shortcut.activated.connect(self.close)
-
-        # Some Qt builds on Windows / Linux leave `QKeySequence.Quit` empty
-        # (no platform default).  Provide an explicit Ctrl+Q fallback so
-        # the advertised shortcut is always honoured.
-        if self._quit_shortcut.key().isEmpty():
-            self._quit_shortcut.setKey(QKeySequence("Ctrl+Q"))
-        else:
-            # Platform supplied a mapping (e.g. Cmd+Q on macOS).  Still
-            # register a literal Ctrl+Q so documentation remains accurate
-            # on every OS.
-            self._quit_shortcut_ctrlq = QShortcut(
-                QKeySequence("Ctrl+Q"), self)
-            self._quit_shortcut_ctrlq.setContext(QtCore.Qt.WindowShortcut)
-            self._quit_shortcut_ctrlq.activated.connect(self.close)
+        # Install only once, for the same reason as the RUN shortcut: a
+        # second action with the same keys would make them ambiguous.
+        if self._quit_shortcut_installed:
+            return
+        self._quit_action = QtWidgets.QAction(self)
+        self._quit_action.setShortcuts(list(_quit_sequences()))
+        self._quit_action.setShortcutContext(QtCore.Qt.WindowShortcut)
+        self._quit_action.triggered.connect(self.close)
+        self.addAction(self._quit_action)
+        self._quit_shortcut_installed = True
 
     # ------------------------------------------------------------------ #
     #  Public slots                                                      #
     # ------------------------------------------------------------------ #
 
+    @QtCore.pyqtSlot()
     def btn_clear_all_clicked(self):
         """
         Restore the dialog to its pristine, just-launched state.
@@ -342,72 +522,49 @@ class Main_Dialog(QMainWindow, Main_UI):
         Attributes reset to ``None``
         ----------------------------
         ``dir_annotations_gt``, ``dir_images_gt``, ``filepath_classes_gt``,
-        ``dir_dets``, ``filepath_classes_det``, ``dir_save_results``
+        ``dir_dets``, ``filepath_classes_det``, ``dir_save_results``; the
+        cached annotations are discarded as well.
 
         Idempotency
         -----------
         The slot is safe to invoke repeatedly; the second and subsequent
         calls are no-ops because every control is already at its default.
         """
-        # 1. Text boxes --------------------------------------------------
-        #    These hold directory / file paths selected via file dialogs.
-        #    ``.clear()`` both empties the visible text and (because the
-        #    widgets are read-only) cannot be undone by the user through
-        #    the keyboard, so no partially-cleared state can linger.
-        for line_edit in (self.txb_gt_dir,
-                          self.txb_gt_images_dir,
-                          self.txb_classes_gt,
-                          self.txb_det_dir,
-                          self.txb_classes_det,
-                          self.txb_output_dir):
-            line_edit.clear()
-
-        # 2. Ground-truth format radio group -----------------------------
-        #    Auto-exclusivity means selecting the default automatically
-        #    deselects whatever was previously checked, but we still loop
-        #    over the remaining buttons for explicitness and to guard
-        #    against future changes to the exclusivity setting.
-        self.rad_gt_format_coco_json.setChecked(True)
-        for rb in (self.rad_gt_format_pascalvoc_xml,
-                   self.rad_gt_format_labelme_xml,
-                   self.rad_gt_format_openimages_csv,
-                   self.rad_gt_format_imagenet_xml,
-                   self.rad_gt_format_yolo_text,
-                   self.rad_gt_format_abs_values_text,
-                   self.rad_gt_format_cvat_xml):
-            rb.setChecked(False)
-
-        # 3. Detection format radio group --------------------------------
-        self.rad_det_ci_format_text_yolo_rel.setChecked(True)
-        for rb in (self.rad_det_ci_format_text_xyx2y2_abs,
-                   self.rad_det_ci_format_text_xywh_abs,
-                   self.rad_det_format_coco_json,
-                   self.rad_det_cn_format_text_yolo_rel,
-                   self.rad_det_cn_format_text_xyx2y2_abs,
-                   self.rad_det_cn_format_text_xywh_abs):
-            rb.setChecked(False)
-
-        # 4. Metric check boxes ------------------------------------------
-        #    The Designer default is "all metrics enabled"; matching that
-        #    here keeps Clear All intuitive (a reset, not a blank slate).
-        for cb in (self.chb_metric_AP_coco,
-                   self.chb_metric_AP50_coco,
-                   self.chb_metric_AP75_coco,
-                   self.chb_metric_APsmall_coco,
-                   self.chb_metric_APmedium_coco,
-                   self.chb_metric_APlarge_coco,
-                   self.chb_metric_AR_max1,
-                   self.chb_metric_AR_max10,
-                   self.chb_metric_AR_max100,
-                   self.chb_metric_AR_small,
-                   self.chb_metric_AR_medium,
-                   self.chb_metric_AR_large,
-                   self.chb_metric_AP_pascal,
-                   self.chb_metric_mAP_pascal):
-            cb.setChecked(True)
-
-        # 5. IOU threshold spin box --------------------------------------
-        self.dsb_IOU_pascal.setValue(DEFAULT_IOU_THRESHOLD)
+        # Repaint once after every control has been reset, rather than
+        # once per widget change, and keep the radios, check boxes and spin
+        # box from emitting toggled/stateChanged/valueChanged for each step.
+        self.setUpdatesEnabled(False)
+        blockers = [QtCore.QSignalBlocker(w) for w in self._silent_reset_widgets]
+        try:
+            # 1. Text boxes ----------------------------------------------
+            #    These hold directory / file paths selected via file dialogs.
+            #    ``.clear()`` both empties the visible text and (because the
+            #    widgets are read-only) cannot be undone by the user through
+            #    the keyboard, so no partially-cleared state can linger.
+            for line_edit in self._line_edits:
+                line_edit.clear()
+
+            # 2. Ground-truth format radio group -------------------------
+            #    Every GT radio button lives in ``frame`` and is auto-exclusive,
+            #    so checking the default unchecks whichever one was selected.
+            self.rad_gt_format_coco_json.setChecked(True)
+
+            # 3. Detection format radio group ----------------------------
+            #    Same for the detection buttons, which all live in ``frame_4``.
+            self.rad_det_ci_format_text_yolo_rel.setChecked(True)
+
+            # 4. Metric check boxes --------------------------------------
+            #    The Designer default is "all metrics enabled"; matching that
+            #    here keeps Clear All intuitive (a reset, not a blank slate).
+            for cb in self._metric_checkboxes:
+                cb.setChecked(True)
+
+            # 5. IOU threshold spin box ----------------------------------
+            self.dsb_IOU_pascal.setValue(DEFAULT_IOU_THRESHOLD)
+        finally:
+            for blocker in blockers:
+                blocker.unblock()
+            self.setUpdatesEnabled(True)
 
         # 6. Internal cache ----------------------------------------------
         #    These mirrors are what the evaluator methods actually read.
@@ -419,19 +576,26 @@ class Main_Dialog(QMainWindow, Main_UI):
         self.dir_dets = None
         self.filepath_classes_det = None
         self.dir_save_results = None
+        self._annotations_cache.clear()
 
     def center_screen(self):
         size = self.size()
-        desktopSize = QtWidgets.QDesktopWidget().screenGeometry()
-        top = int((desktopSize.height() / 2) - (size.height() / 2))
-        left = int((desktopSize.width() / 2) - (size.width() / 2))
+        screen = QtGui.QGuiApplication.primaryScreen().availableGeometry()
+        top = screen.y() + (screen.height() - size.height()) // 2
+        left = screen.x() + (screen.width() - size.width()) // 2
         self.move(left, top)
 
     def closeEvent(self, event):
-        conf = self.show_popup('Are you sure you want to close the program?',
-                               'Closing',
-                               buttons=QMessageBox.Yes | QMessageBox.No,
-                               icon=QMessageBox.Question)
+        # A running evaluation must finish before its thread is destroyed. Waiting for it here
+        # would freeze the window, so closing is refused and the progress dialog stays up
+        if self._metrics_worker is not None:
+            self.show_popup('The metrics are still being computed. Close the application when they are done.',
+                            'Evaluation running',
+                            buttons=QMessageBox.Ok,
+                            icon=QMessageBox.Information)
+            event.ignore()
+            return
+        conf = self.close_confirm_box.exec()
         if conf == QMessageBox.Yes:
             event.accept()
         else:
@@ -448,44 +612,248 @@ class Main_Dialog(QMainWindow, Main_UI):
         self.msgBox.setStandardButtons(buttons)
         return self.msgBox.exec()
 
+    def _check_all(self, checks):
+        """
+        Evaluate ``checks``, a sequence of ``(check, message, title)``
+        tuples, in order and stop at the first ``check()`` that returns a
+        false value, showing its ``message`` in a popup (unless it is
+        ``None``, for checks that report their own errors).
+
+        Return ``True`` if every check passed.  Checks after a failure are
+        not called, so expensive ones (such as loading annotations) should
+        come last.
+        """
+        for check, message, title in checks:
+            if not check():
+                if message is not None:
+                    self.show_popup(message,
+                                    title,
+                                    buttons=QMessageBox.Ok,
+                                    icon=QMessageBox.Information)
+                return False
+        return True
+
+    def _gt_loaders(self):
+        """
+        Map each ground-truth format radio button to a zero-argument loader.
+
+        Built on the first call, which also imports the converters, and
+        reused afterwards.  The loaders read the path attributes when
+        called, so the table never goes stale.
+        """
+        if self._gt_dispatch is None:
+            import src.utils.converter as converter
+            self._gt_dispatch = {
+                self.rad_gt_format_coco_json:
+                lambda: converter.coco2bb(self.dir_annotations_gt),
+                self.rad_gt_format_cvat_xml:
+                lambda: converter.cvat2bb(self.dir_annotations_gt),
+                self.rad_gt_format_openimages_csv:
+                lambda: converter.openimage2bb(self.dir_annotations_gt, self.dir_images_gt,
+                                               BBType.GROUND_TRUTH),
+                self.rad_gt_format_labelme_xml:
+                lambda: converter.labelme2bb(self.dir_annotations_gt),
+                self.rad_gt_format_pascalvoc_xml:
+                lambda: converter.vocpascal2bb(self.dir_annotations_gt),
+                self.rad_gt_format_imagenet_xml:
+                lambda: converter.imagenet2bb(self.dir_annotations_gt),
+                self.rad_gt_format_abs_values_text:
+                lambda: converter.text2bb(self.dir_annotations_gt, bb_type=BBType.GROUND_TRUTH),
+                self.rad_gt_format_yolo_text:
+                lambda: converter.yolo2bb(self.dir_annotations_gt,
+                                          self.dir_images_gt,
+                                          self.filepath_classes_gt,
+                                          bb_type=BBType.GROUND_TRUTH),
+            }
+        return self._gt_dispatch
+
+    def _det_loaders(self):
+        """
+        Map each detection format radio button to a zero-argument loader.
+
+        The *<class_id>* and *<class_name>* variants of a text format share
+        the same loader; class ids are replaced by names afterwards in
+        :meth:`load_annotations_det`.
+        """
+        if self._det_dispatch is None:
+            import src.utils.converter as converter
+
+            def text_loader(bb_format, type_coordinates):
+                return lambda: converter.text2bb(self.dir_dets,
+                                                 bb_type=BBType.DETECTED,
+                                                 bb_format=bb_format,
+                                                 type_coordinates=type_coordinates,
+                                                 img_dir=self.dir_images_gt)
+
+            yolo_rel = text_loader(BBFormat.YOLO, CoordinatesType.RELATIVE)
+            xyx2y2_abs = text_loader(BBFormat.XYX2Y2, CoordinatesType.ABSOLUTE)
+            xywh_abs = text_loader(BBFormat.XYWH, CoordinatesType.ABSOLUTE)
+            self._det_dispatch = {
+                self.rad_det_format_coco_json:
+                lambda: converter.coco2bb(self.dir_dets, bb_type=BBType.DETECTED),
+                self.rad_det_ci_format_text_yolo_rel: yolo_rel,
+                self.rad_det_cn_format_text_yolo_rel: yolo_rel,
+                self.rad_det_ci_format_text_xyx2y2_abs: xyx2y2_abs,
+                self.rad_det_cn_format_text_xyx2y2_abs: xyx2y2_abs,
+                self.rad_det_ci_format_text_xywh_abs: xywh_abs,
+                self.rad_det_cn_format_text_xywh_abs: xywh_abs,
+            }
+        return self._det_dispatch
+
+    def _gt_inputs(self, fmt):
+        """
+        Return the paths the loader of the ground-truth format ``fmt``
+        reads, which key its cached annotations (see :meth:`_load_cached`).
+
+        Only the formats that need the image sizes or the class list
+        include those paths, so the other formats never walk the image
+        directory.
+        """
+        if fmt is self.rad_gt_format_yolo_text:
+            return (self.dir_annotations_gt, self.dir_images_gt, self.filepath_classes_gt)
+        if fmt is self.rad_gt_format_openimages_csv:
+            return (self.dir_annotations_gt, self.dir_images_gt)
+        return (self.dir_annotations_gt, )
+
+    def _det_inputs(self, fmt):
+        """Same as :meth:`_gt_inputs` for the detection format ``fmt``."""
+        paths = (self.dir_dets, )
+        if fmt in self._det_relative_formats:
+            paths += (self.dir_images_gt, )
+        if fmt in self._det_class_id_formats:
+            paths += (self.filepath_classes_det, )
+        return paths
+
+    def _choose_path(self, caption, directory, on_selected, file_filter=None):
+        """
+        Let the user pick a directory (or, with ``file_filter``, an existing
+        file) without blocking the event loop.
+
+        The dialog is opened window-modal with :meth:`QFileDialog.open`
+        instead of the static ``getExistingDirectory`` /
+        ``getOpenFileName`` helpers, so the main window keeps repainting
+        while the dialog enumerates the file system.  ``on_selected`` is
+        called with the chosen path, or with ``''`` if the user cancels -
+        the same values the static helpers returned.
+        """
+        dialog = QFileDialog(self, caption, directory)
+        if file_filter is None:
+            dialog.setFileMode(QFileDialog.Directory)
+            dialog.setOption(QFileDialog.ShowDirsOnly, True)
+        else:
+            dialog.setFileMode(QFileDialog.ExistingFile)
+            dialog.setNameFilter(file_filter)
+        dialog.setAttribute(QtCore.Qt.WA_DeleteOnClose)
+
+        def finished(result):
+            selected = dialog.selectedFiles() if result == QFileDialog.Accepted else []
+            on_selected(selected[0] if selected else '')
+
+        dialog.finished.connect(finished)
+        dialog.open()
+
+    def _path_check(self, check, path):
+        """
+        ``check(path)`` (``os.path.isdir`` or ``os.path.isfile``), reusing
+        the result of the same check of ``path`` made less than
+        :data:`_PATH_CHECK_TTL` seconds ago.  ``False`` if ``path`` is
+        ``None``.
+
+        Each check is a ``stat()`` call, which is slow on network-mounted
+        directories.
+        """
+        if path is None:
+            return False
+        now = time.monotonic()
+        key = (check, path)
+        hit = self._path_check_cache.get(key)
+        if hit is not None and now - hit[0] < _PATH_CHECK_TTL:
+            return hit[1]
+        ok = check(path)
+        self._path_check_cache[key] = (now, ok)
+        return ok
+
+    def _isdir(self, path):
+        """``os.path.isdir(path)`` through :meth:`_path_check`."""
+        return self._path_check(os.path.isdir, path)
+
+    def _isfile(self, path):
+        """``os.path.isfile(path)`` through :meth:`_path_check`."""
+        return self._path_check(os.path.isfile, path)
+
+    def _forget_path(self, path):
+        """
+        Drop the cached checks of ``path``, so the next one reads the file
+        system.  Called when the user picks a path, which may have just
+        been created in the file dialog.
+        """
+        self._path_check_cache.pop((os.path.isdir, path), None)
+        self._path_check_cache.pop((os.path.isfile, path), None)
+
+    def _signature(self, path):
+        """
+        :func:`_path_signature` of ``path``, reusing the result of a call
+        for the same path made less than :data:`_PATH_CHECK_TTL` seconds
+        ago.
+
+        The ground-truth and the detection loads of one click may both
+        read the image directory, which would otherwise be walked twice.
+        """
+        now = time.monotonic()
+        hit = self._signature_cache.get(path)
+        if hit is not None and now - hit[0] < _PATH_CHECK_TTL:
+            return hit[1]
+        signature = _path_signature(path)
+        self._signature_cache[path] = (now, signature)
+        return signature
+
+    def _load_cached(self, kind, fmt, paths, load):
+        """
+        Return ``load()``, reusing the annotations of the previous call for
+        ``kind`` ('gt' or 'det') if the format and the ``paths`` it reads
+        are unchanged, both in value and in :meth:`_signature`.
+
+        A shallow copy of the cached list is returned, so callers can
+        extend or reorder it freely.
+        """
+        key = (fmt, tuple((path, self._signature(path)) for path in paths))
+        cached = self._annotations_cache.get(kind)
+        if cached is None or cached[0] != key:
+            cached = (key, load())
+            self._annotations_cache[kind] = cached
+        return list(cached[1])
+
     def load_annotations_gt(self):
         ret = []
-        if self.rad_gt_format_coco_json.isChecked():
-            ret = converter.coco2bb(self.dir_annotations_gt)
-        elif self.rad_gt_format_cvat_xml.isChecked():
-            ret = converter.cvat2bb(self.dir_annotations_gt)
-        elif self.rad_gt_format_openimages_csv.isChecked():
-            ret = converter.openimage2bb(self.dir_annotations_gt, self.dir_images_gt,
-                                         BBType.GROUND_TRUTH)
-        elif self.rad_gt_format_labelme_xml.isChecked():
-            ret = converter.labelme2bb(self.dir_annotations_gt)
-        elif self.rad_gt_format_pascalvoc_xml.isChecked():
-            ret = converter.vocpascal2bb(self.dir_annotations_gt)
-        elif self.rad_gt_format_imagenet_xml.isChecked():
-            ret = converter.imagenet2bb(self.dir_annotations_gt)
-        elif self.rad_gt_format_abs_values_text.isChecked():
-            ret = converter.text2bb(self.dir_annotations_gt, bb_type=BBType.GROUND_TRUTH)
-        elif self.rad_gt_format_yolo_text.isChecked():
-            ret = converter.yolo2bb(self.dir_annotations_gt,
-                                    self.dir_images_gt,
-                                    self.filepath_classes_gt,
-                                    bb_type=BBType.GROUND_TRUTH)
-        # Make all types as GT
-        [bb.set_bb_type(BBType.GROUND_TRUTH) for bb in ret]
+        fmt = self._current_gt_format()
+        load = self._gt_loaders().get(fmt)
+
+        def load_gt():
+            ret = load()
+            # Make all types as GT (done before caching, so cached boxes are not visited again)
+            for bb in ret:
+                bb.set_bb_type(BBType.GROUND_TRUTH)
+            return ret
+
+        if load is not None:
+            ret = self._load_cached('gt', fmt, self._gt_inputs(fmt), load_gt)
         return ret
 
-    def validate_det_choices(self):
+    def validate_det_choices(self, fmt=None):
+        if fmt is None:
+            fmt = self._current_det_format()
         # If relative format was required, directory with images have to be valid
-        if self.rad_det_ci_format_text_yolo_rel.isChecked(
-        ) or self.rad_det_cn_format_text_yolo_rel.isChecked():
+        if fmt in self._det_relative_formats:
             # Verify if directory with images was provided
             valid_image_dir = False
-            if self.dir_images_gt is not None and os.path.isdir(self.dir_images_gt):
-                found_image_files = general_utils.get_files_dir(
-                    self.dir_images_gt, extensions=['jpg', 'jpge', 'png', 'bmp', 'tiff', 'tif'])
-                if len(found_image_files) != 0:
-                    valid_image_dir = True
-            if valid_image_dir is False:
+            if self._isdir(self.dir_images_gt):
+                # _isdir may be up to _PATH_CHECK_TTL old: the directory can be gone by now
+                try:
+                    valid_image_dir = _has_image_files(self.dir_images_gt,
+                                                       os.stat(self.dir_images_gt).st_mtime_ns)
+                except OSError:
+                    pass
+            if not valid_image_dir:
                 self.show_popup(
                     f'For the selected annotation type, it is necessary to inform a directory with the dataset images.\nDirectory is empty or does not have valid images.',
                     'Invalid image directory',
@@ -493,52 +861,62 @@ class Main_Dialog(QMainWindow, Main_UI):
                     icon=QMessageBox.Information)
                 return False
         # if its detection format requires class_id, text file containing the classes of objects must be informed
-        if self.rad_det_ci_format_text_yolo_rel.isChecked(
-        ) or self.rad_det_ci_format_text_xyx2y2_abs.isChecked(
-        ) or self.rad_det_ci_format_text_xywh_abs.isChecked():
-            # Verify if text file with classes was provided
-            valid_txt_file = False
-            if self.filepath_classes_det is not None and os.path.isfile(self.filepath_classes_det):
-                classes = general_utils.get_classes_from_txt_file(self.filepath_classes_det)
-                if len(classes) != 0:
-                    valid_txt_file = True
-            if valid_txt_file is False:
-                self.show_popup(
-                    f'For the selected annotation type, it is necessary to inform a valid text file listing one class per line.\nCheck if the path for the .txt file is correct and if it contains at least one class.',
-                    'Invalid text file or not found',
-                    buttons=QMessageBox.Ok,
-                    icon=QMessageBox.Information)
-                return False
+        if fmt in self._det_class_id_formats and not self._det_classes():
+            self._show_invalid_det_classes()
+            return False
         return True
 
+    def _det_classes(self):
+        """
+        Return the classes listed in the detection classes file (see
+        :func:`_read_classes`), or ``None`` if it is unset or cannot be read.
+
+        The file is stat'ed and read directly, with no separate (possibly
+        stale) :meth:`_isfile` check, so a file removed meanwhile gives
+        ``None`` rather than an exception inside the slot.
+        """
+        if self.filepath_classes_det is None:
+            return None
+        try:
+            return _read_classes(self.filepath_classes_det,
+                                 os.stat(self.filepath_classes_det).st_mtime_ns)
+        except OSError:
+            return None
+
+    def _show_invalid_det_classes(self):
+        self.show_popup(
+            f'For the selected annotation type, it is necessary to inform a valid text file listing one class per line.\nCheck if the path for the .txt file is correct and if it contains at least one class.',
+            'Invalid text file or not found',
+            buttons=QMessageBox.Ok,
+            icon=QMessageBox.Information)
+
     def load_annotations_det(self):
+        import src.utils.general_utils as general_utils
         ret = []
-        if not self.validate_det_choices():
+        fmt = self._current_det_format()
+        if not self.validate_det_choices(fmt):
             return ret, False
-
-        if self.rad_det_format_coco_json.isChecked():
-            ret = converter.coco2bb(self.dir_dets, bb_type=BBType.DETECTED)
-        elif self.rad_det_ci_format_text_yolo_rel.isChecked(
-        ) or self.rad_det_cn_format_text_yolo_rel.isChecked():
-            ret = converter.text2bb(self.dir_dets,
-                                    bb_type=BBType.DETECTED,
-                                    bb_format=BBFormat.YOLO,
-                                    type_coordinates=CoordinatesType.RELATIVE,
-                                    img_dir=self.dir_images_gt)
-        elif self.rad_det_ci_format_text_xyx2y2_abs.isChecked(
-        ) or self.rad_det_cn_format_text_xyx2y2_abs.isChecked():
-            ret = converter.text2bb(self.dir_dets,
-                                    bb_type=BBType.DETECTED,
-                                    bb_format=BBFormat.XYX2Y2,
-                                    type_coordinates=CoordinatesType.ABSOLUTE,
-                                    img_dir=self.dir_images_gt)
-        elif self.rad_det_ci_format_text_xywh_abs.isChecked(
-        ) or self.rad_det_cn_format_text_xywh_abs.isChecked():
-            ret = converter.text2bb(self.dir_dets,
-                                    bb_type=BBType.DETECTED,
-                                    bb_format=BBFormat.XYWH,
-                                    type_coordinates=CoordinatesType.ABSOLUTE,
-                                    img_dir=self.dir_images_gt)
+        classes = None
+        if fmt in self._det_class_id_formats:
+            # Read again (cached if unchanged): the file may have been removed since it was validated
+            classes = self._det_classes()
+            if not classes:
+                self._show_invalid_det_classes()
+                return ret, False
+
+        load = self._det_loaders().get(fmt)
+
+        def load_det():
+            ret = load()
+            # If detection requires class_id, replace the detection names (integers) by a class from the txt file
+            # (done before caching, as the boxes are modified in place)
+            if len(ret) != 0 and classes is not None:
+                ret = general_utils.replace_id_with_classes(ret, self.filepath_classes_det,
+                                                            classes)
+            return ret
+
+        if load is not None:
+            ret = self._load_cached('det', fmt, self._det_inputs(fmt), load_det)
         # Verify if for the selected format, detections were found
         if len(ret) == 0:
             self.show_popup(
@@ -547,19 +925,13 @@ class Main_Dialog(QMainWindow, Main_UI):
                 buttons=QMessageBox.Ok,
                 icon=QMessageBox.Information)
             return ret, False
-
-        # If detection requires class_id, replace the detection names (integers) by a class from the txt file
-        if self.rad_det_ci_format_text_yolo_rel.isChecked(
-        ) or self.rad_det_ci_format_text_xyx2y2_abs.isChecked(
-        ) or self.rad_det_ci_format_text_xywh_abs.isChecked():
-            ret = general_utils.replace_id_with_classes(ret, self.filepath_classes_det)
         return ret, True
 
+    @QtCore.pyqtSlot()
     def btn_gt_statistics_clicked(self):
         # If yolo format is selected, file with classes must be informed
-        if self.rad_gt_format_yolo_text.isChecked():
-            if self.filepath_classes_gt is None or os.path.isfile(
-                    self.filepath_classes_gt) is False:
+        if self._current_gt_format() is self.rad_gt_format_yolo_text:
+            if not self._isfile(self.filepath_classes_gt):
                 self.show_popup(
                     'For the selected groundtruth format, a valid file with classes must be informed.',
                     'Invalid file',
@@ -586,76 +958,100 @@ class Main_Dialog(QMainWindow, Main_UI):
         self.dialog_statistics.show_dialog(BBType.GROUND_TRUTH, gt_annotations, None,
                                            self.dir_images_gt)
 
+    @QtCore.pyqtSlot()
     def btn_gt_dir_clicked(self):
         if self.txb_gt_dir.text() == '':
             txt = self.current_directory
         else:
             txt = self.txb_gt_dir.text()
-        directory = QFileDialog.getExistingDirectory(
-            self, 'Choose directory with ground truth annotations', txt)
+        self._choose_path('Choose directory with ground truth annotations', txt,
+                          self._on_gt_dir_selected)
+
+    def _on_gt_dir_selected(self, directory):
         if directory == '':
             return
-        if os.path.isdir(directory):
+        # Drop the annotations parsed from the previous directory
+        self._annotations_cache.pop('gt', None)
+        self._forget_path(directory)
+        if self._isdir(directory):
             self.txb_gt_dir.setText(directory)
             self.dir_annotations_gt = directory
         else:
             self.dir_annotations_gt = None
 
+    @QtCore.pyqtSlot()
     def btn_gt_classes_clicked(self):
-        filepath = QFileDialog.getOpenFileName(self, 'Choose a file with a list of classes',
-                                               self.current_directory,
-                                               "Image files (*.txt *.names)")
-        filepath = filepath[0]
-        if os.path.isfile(filepath):
+        self._choose_path('Choose a file with a list of classes',
+                          self.current_directory,
+                          self._on_gt_classes_selected,
+                          file_filter="Image files (*.txt *.names)")
+
+    def _on_gt_classes_selected(self, filepath):
+        self._forget_path(filepath)
+        if self._isfile(filepath):
             self.txb_classes_gt.setText(filepath)
             self.filepath_classes_gt = filepath
         else:
             self.filepath_classes_gt = None
 
+    @QtCore.pyqtSlot()
     def btn_gt_images_dir_clicked(self):
         if self.txb_gt_images_dir.text() == '':
             txt = self.current_directory
         else:
             txt = self.txb_gt_images_dir.text()
-        directory = QFileDialog.getExistingDirectory(self,
-                                                     'Choose directory with ground truth images',
-                                                     txt)
+        self._choose_path('Choose directory with ground truth images', txt,
+                          self._on_gt_images_dir_selected)
+
+    def _on_gt_images_dir_selected(self, directory):
         if directory != '':
+            self._forget_path(directory)
             self.txb_gt_images_dir.setText(directory)
             self.dir_images_gt = directory
 
+    @QtCore.pyqtSlot()
     def btn_det_classes_clicked(self):
-        filepath = QFileDialog.getOpenFileName(self, 'Choose a file with a list of classes',
-                                               self.current_directory,
-                                               "Image files (*.txt *.names)")
-        filepath = filepath[0]
-        if os.path.isfile(filepath):
+        self._choose_path('Choose a file with a list of classes',
+                          self.current_directory,
+                          self._on_det_classes_selected,
+                          file_filter="Image files (*.txt *.names)")
+
+    def _on_det_classes_selected(self, filepath):
+        self._forget_path(filepath)
+        if self._isfile(filepath):
             self.txb_classes_det.setText(filepath)
             self.filepath_classes_det = filepath
         else:
             self.filepath_classes_det = None
             self.txb_classes_det.setText('')
 
+    @QtCore.pyqtSlot()
     def btn_det_dir_clicked(self):
         if self.txb_det_dir.text() == '':
             txt = self.current_directory
         else:
             txt = self.txb_det_dir.text()
-        directory = QFileDialog.getExistingDirectory(self, 'Choose directory with detections', txt)
+        self._choose_path('Choose directory with detections', txt, self._on_det_dir_selected)
+
+    def _on_det_dir_selected(self, directory):
         if directory == '':
             return
-        if os.path.isdir(directory):
+        # Drop the detections parsed from the previous directory
+        self._annotations_cache.pop('det', None)
+        self._forget_path(directory)
+        if self._isdir(directory):
             self.txb_det_dir.setText(directory)
             self.dir_dets = directory
         else:
             self.dir_dets = None
 
+    @QtCore.pyqtSlot()
     def btn_statistics_det_clicked(self):
         det_annotations, passed = self.load_annotations_det()
         if passed is False:
             return
         gt_annotations = self.load_annotations_gt()
-        if self.dir_images_gt is None or os.path.isdir(self.dir_images_gt) is False:
+        if not self._isdir(self.dir_images_gt):
             self.show_popup(
                 'Directory with ground-truth images was not specified or do not contain images.',
                 'Images not found',
@@ -666,113 +1062,118 @@ class Main_Dialog(QMainWindow, Main_UI):
         self.dialog_statistics.show_dialog(BBType.DETECTED, gt_annotations, det_annotations,
                                            self.dir_images_gt)
 
+    @QtCore.pyqtSlot()
     def btn_output_dir_clicked(self):
         if self.txb_output_dir.text() == '':
             txt = self.current_directory
         else:
             txt = self.txb_output_dir.text()
-        directory = QFileDialog.getExistingDirectory(self, 'Choose directory to save the results',
-                                                     txt)
-        if os.path.isdir(directory):
+        self._choose_path('Choose directory to save the results', txt,
+                          self._on_output_dir_selected)
+
+    def _on_output_dir_selected(self, directory):
+        self._forget_path(directory)
+        if self._isdir(directory):
             self.txb_output_dir.setText(directory)
             self.dir_save_results = directory
         else:
             self.dir_save_results = None
 
+    @QtCore.pyqtSlot()
     def btn_run_clicked(self):
-        if self.dir_save_results is None or os.path.isdir(self.dir_save_results) is False:
-            self.show_popup('Output directory to save results was not specified or does not exist.',
-                            'Invalid output directory',
-                            buttons=QMessageBox.Ok,
-                            icon=QMessageBox.Information)
+        from src.bounding_boxes import count_iou_pairs
+        from src.ui.metrics_worker import MetricsWorker
+        # Ignore RUN while the previous evaluation is still running
+        if self._metrics_worker is not None:
             return
-        # Get detections
-        det_annotations, passed = self.load_annotations_det()
-        if passed is False:
-            return
-        # Verify if there are detections
-        if det_annotations is None or len(det_annotations) == 0:
-            self.show_popup(
-                'No detection of the selected type was found in the folder.\nCheck if the selected type corresponds to the files in the folder and try again.',
-                'Invalid detections',
-                buttons=QMessageBox.Ok,
-                icon=QMessageBox.Information)
-            return
-
-        gt_annotations = self.load_annotations_gt()
-        if gt_annotations is None or len(gt_annotations) == 0:
-            self.show_popup(
-                'No ground-truth bounding box of the selected type was found in the folder.\nCheck if the selected type corresponds to the files in the folder and try again.',
-                'Invalid groundtruths',
-                buttons=QMessageBox.Ok,
-                icon=QMessageBox.Information)
+        # Read every metric check box once
+        coco_flags = {key: cb.isChecked() for key, cb in self._coco_metrics}
+        pascal_flags = {key: cb.isChecked() for key, cb in self._pascal_metrics}
+        annotations = {}
+
+        def load_det():
+            annotations['det'], passed = self.load_annotations_det()
+            return passed
+
+        def load_gt():
+            annotations['gt'] = self.load_annotations_gt()
+            return annotations['gt'] is not None and len(annotations['gt']) != 0
+
+        # Preconditions of the evaluation, checked in order until one fails
+        if not self._check_all((
+            (lambda: self._isdir(self.dir_save_results),
+             'Output directory to save results was not specified or does not exist.',
+             'Invalid output directory'),
+            # Nothing would be computed: do not load the annotations at all
+            (lambda: any(coco_flags.values()) or any(pascal_flags.values()),
+             'No results to show',
+             'No results'),
+            # load_annotations_det reports its own errors
+            (load_det, None, None),
+            (lambda: annotations['det'] is not None and len(annotations['det']) != 0,
+             'No detection of the selected type was found in the folder.\nCheck if the selected type corresponds to the files in the folder and try again.',
+             'Invalid detections'),
+            (load_gt,
+             'No ground-truth bounding box of the selected type was found in the folder.\nCheck if the selected type corresponds to the files in the folder and try again.',
+             'Invalid groundtruths'),
+        )):
             return
+        det_annotations = annotations['det']
+        gt_annotations = annotations['gt']
+
+        # Ask before starting an evaluation that compares too many boxes
+        n_pairs = count_iou_pairs(gt_annotations, det_annotations)
+        if n_pairs > IOU_PAIRS_CONFIRM_THRESHOLD:
+            conf = self.show_popup(
+                f'The evaluation has to compare {n_pairs:,} pairs of boxes and may take a long time.\nDo you want to continue?',
+                'Large evaluation',
+                buttons=QMessageBox.Yes | QMessageBox.No,
+                icon=QMessageBox.Question)
+            if conf != QMessageBox.Yes:
+                return
 
-        coco_res = {}
-        pascal_res = {}
-        # If any coco metric is required
-        if self.chb_metric_AP_coco.isChecked() or self.chb_metric_AP50_coco.isChecked(
-        ) or self.chb_metric_AP75_coco.isChecked() or self.chb_metric_APsmall_coco.isChecked(
-        ) or self.chb_metric_APmedium_coco.isChecked() or self.chb_metric_APlarge_coco.isChecked(
-        ) or self.chb_metric_AR_max1.isChecked() or self.chb_metric_AR_max10.isChecked(
-        ) or self.chb_metric_AR_max100.isChecked() or self.chb_metric_AR_small.isChecked(
-        ) or self.chb_metric_AR_medium.isChecked() or self.chb_metric_AR_large.isChecked():
-            coco_res = get_coco_summary(gt_annotations, det_annotations)
-            # Remove not checked metrics
-            if not self.chb_metric_AP_coco.isChecked():
-                del coco_res['AP']
-            if not self.chb_metric_AP50_coco.isChecked():
-                del coco_res['AP50']
-            if not self.chb_metric_AP75_coco.isChecked():
-                del coco_res['AP75']
-            if not self.chb_metric_APsmall_coco.isChecked():
-                del coco_res['APsmall']
-            if not self.chb_metric_APmedium_coco.isChecked():
-                del coco_res['APmedium']
-            if not self.chb_metric_APlarge_coco.isChecked():
-                del coco_res['APlarge']
-            if not self.chb_metric_AR_max1.isChecked():
-                del coco_res['AR1']
-            if not self.chb_metric_AR_max10.isChecked():
-                del coco_res['AR10']
-            if not self.chb_metric_AR_max100.isChecked():
-                del coco_res['AR100']
-            if not self.chb_metric_AR_small.isChecked():
-                del coco_res['ARsmall']
-            if not self.chb_metric_AR_medium.isChecked():
-                del coco_res['ARmedium']
-            if not self.chb_metric_AR_large.isChecked():
-                del coco_res['ARlarge']
-        # If any pascal metric is required
-        if self.chb_metric_AP_pascal.isChecked() or self.chb_metric_mAP_pascal.isChecked():
-            iou_threshold = self.dsb_IOU_pascal.value()
-            pascal_res = get_pascalvoc_metrics(gt_annotations,
-                                               det_annotations,
-                                               iou_threshold=iou_threshold,
-                                               generate_table=True)
-            mAP = pascal_res['mAP']
-
-            if not self.chb_metric_AP_pascal.isChecked():
-                del pascal_res['per_class']
-            if not self.chb_metric_mAP_pascal.isChecked():
-                del pascal_res['mAP']
-
-            if 'per_class' in pascal_res:
-                # Save a single plot with all classes
-                plot_precision_recall_curve(pascal_res['per_class'],
-                                            mAP=mAP,
-                                            savePath=self.dir_save_results,
-                                            showGraphic=False)
-                # Save plots for each class
-                plot_precision_recall_curves(pascal_res['per_class'],
-                                             showAP=True,
-                                             savePath=self.dir_save_results,
-                                             showGraphic=False)
-
-        if len(coco_res) + len(pascal_res) == 0:
-            self.show_popup('No results to show',
-                            'No results',
-                            buttons=QMessageBox.Ok,
-                            icon=QMessageBox.Information)
-        else:
-            self.dialog_results.show_dialog(coco_res, pascal_res, self.dir_save_results)
+        # Evaluate in a worker thread (which runs COCO and PASCAL VOC in parallel processes)
+        # and show the results when it is done; the progress dialog keeps the window modal.
+        iou_threshold = self.dsb_IOU_pascal.value() if any(pascal_flags.values()) else None
+        # The per-class tables and graphs are only needed if the per-class results are kept
+        plots_dir = self.dir_save_results if pascal_flags['per_class'] else None
+        worker = MetricsWorker(gt_annotations,
+                               det_annotations,
+                               any(coco_flags.values()),
+                               iou_threshold,
+                               generate_table=pascal_flags['per_class'],
+                               plots_dir=plots_dir,
+                               parent=self)
+        progress = QtWidgets.QProgressDialog('Computing the metrics...', '', 0, 0, self)
+        progress.setWindowTitle('Running')
+        progress.setCancelButton(None)
+        progress.setWindowModality(QtCore.Qt.WindowModal)
+        progress.setMinimumDuration(0)
+        worker.metrics_ready.connect(
+            functools.partial(self._show_metrics, coco_flags, pascal_flags))
+        worker.failed.connect(self._on_metrics_failed)
+        worker.finished.connect(functools.partial(self._on_metrics_finished, progress))
+        self._metrics_worker = worker
+        self.btn_run.setEnabled(False)
+        worker.start()
+        progress.show()
+
+    def _on_metrics_finished(self, progress):
+        progress.close()
+        progress.deleteLater()
+        self._metrics_worker.deleteLater()
+        self._metrics_worker = None
+        self.btn_run.setEnabled(True)
+
+    def _on_metrics_failed(self, message):
+        self.show_popup(f'The metrics could not be computed.\n{message}',
+                        'Evaluation failed',
+                        buttons=QMessageBox.Ok,
+                        icon=QMessageBox.Warning)
+
+    def _show_metrics(self, coco_flags, pascal_flags, coco_res, pascal_res):
+        # Keep only the checked metrics (the PASCAL VOC graphs were saved by the worker)
+        coco_res = {k: v for k, v in coco_res.items() if coco_flags[k]}
+        pascal_res = {k: v for k, v in pascal_res.items() if pascal_flags[k]}
+        # btn_run_clicked does not start an evaluation without a checked metric
+        self.dialog_results.show_dialog(coco_res, pascal_res, self.dir_save_results)
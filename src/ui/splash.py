@@ -1,4 +1,4 @@
-from PyQt5 import QtCore, QtWidgets
+from PyQt5 import QtCore, QtGui
 from PyQt5.QtWidgets import QMainWindow
 from src.ui.splash_ui import Ui_Dialog as Splash_UI
 
@@ -13,9 +13,9 @@ class Splash_Dialog(QMainWindow, Splash_UI):
 
     def center_screen(self):
         size = self.size()
-        desktopSize = QtWidgets.QDesktopWidget().screenGeometry()
-        top = int((desktopSize.height() / 2) - (size.height() / 2))
-        left = int((desktopSize.width() / 2) - (size.width() / 2))
+        screen = QtGui.QGuiApplication.primaryScreen().availableGeometry()
+        top = screen.y() + (screen.height() - size.height()) // 2
+        left = screen.x() + (screen.width() - size.width()) // 2
         self.move(left, top)
 
     def btn_close_clicked(self):
@@ -18,8 +18,10 @@ def get_classes_from_txt_file(filepath_classes_det):
     return classes
 
 
-def replace_id_with_classes(bounding_boxes, filepath_classes_det):
-    classes = get_classes_from_txt_file(filepath_classes_det)
+def replace_id_with_classes(bounding_boxes, filepath_classes_det, classes=None):
+    # classes: the dictionary already read from filepath_classes_det, if available
+    if classes is None:
+        classes = get_classes_from_txt_file(filepath_classes_det)
     for bb in bounding_boxes:
         if not is_str_int(bb.get_class_id()):
             print(
@@ -122,19 +124,29 @@ def remove_file_extension(filename):
     return os.path.join(os.path.dirname(filename), os.path.splitext(filename)[0])
 
 
+def iter_files_dir(directory, extensions=['*']):
+    # Same as get_files_dir, but yields the names in directory order as the directory is read, so
+    # a caller that only needs the first match does not list the whole directory
+    # '*' and None accept all extensions (and, as os.listdir, also yield subdirectories)
+    if '*' in extensions or None in extensions:
+        yield from os.listdir(directory)
+        return
+    # Normalize once to lowercase; as before, an extension without any dot gets a leading one and
+    # the names are compared by their ending, so multi-dot extensions such as 'tar.gz' still match
+    suffixes = tuple(
+        {ext.lower() if '.' in ext else f'.{ext.lower()}'
+         for ext in extensions})
+    # scandir's entries carry the file type, so is_file() rarely needs a stat
+    with os.scandir(directory) as it:
+        for e in it:
+            if e.name.lower().endswith(suffixes) and e.is_file():
+                yield e.name
+
+
 def get_files_dir(directory, extensions=['*']):
-    ret = []
-    for extension in extensions:
-        if extension == '*':
-            ret += [f for f in os.listdir(directory)]
-            continue
-        elif extension is None:
-            # accepts all extensions
-            extension = ''
-        elif '.' not in extension:
-            extension = f'.{extension}'
-        ret += [f for f in os.listdir(directory) if f.lower().endswith(extension.lower())]
-    return ret
+    # Names of the files of directory with one of the extensions (case insensitive), sorted so
+    # the order does not depend on the file system
+    return sorted(iter_files_dir(directory, extensions))
 
 
 def remove_file_extension(filename):
@@ -0,0 +1,59 @@
+import numpy as np
+from src.bounding_box import BBFormat, BBType, BoundingBox
+from src.bounding_boxes import BoundingBoxes, count_iou_pairs, group_indices
+
+
+def _box(image, class_id, bb_type=BBType.GROUND_TRUTH, confidence=None):
+    return BoundingBox(image,
+                       class_id, (0, 0, 10, 10),
+                       bb_type=bb_type,
+                       confidence=confidence,
+                       format=BBFormat.XYX2Y2)
+
+
+gts = [_box('img1', 'a'), _box('img1', 'a'), _box('img1', 'b'), _box('img2', 'a')]
+dts = [
+    _box('img1', 'a', BBType.DETECTED, 0.9),
+    _box('img1', 'b', BBType.DETECTED, 0.8),
+    _box('img1', 'b', BBType.DETECTED, 0.7),
+    _box('img2', 'b', BBType.DETECTED, 0.6),
+    # class only in the detections
+    _box('img2', 'c', BBType.DETECTED, 0.5),
+]
+
+
+def test_count_iou_pairs():
+    assert count_iou_pairs([], []) == 0
+    assert count_iou_pairs(gts, []) == 0
+    assert count_iou_pairs([], dts) == 0
+    # Same as comparing every detection with every ground truth of its image and class
+    naive = sum(1 for d in dts for g in gts
+                if (d.get_image_name(), d.get_class_id()) == (g.get_image_name(),
+                                                              g.get_class_id()))
+    assert naive == 4
+    assert count_iou_pairs(gts, dts) == naive
+    # BoundingBoxes are accepted as well
+    gt_bbs = BoundingBoxes(gts)
+    assert count_iou_pairs(
+        gt_bbs,
+        BoundingBoxes(dts, image_index=gt_bbs.image_index, class_index=gt_bbs.class_index)) == naive
+
+
+def test_group_indices():
+    assert group_indices(np.array([], dtype=np.int64)) == {}
+    groups = group_indices(np.array([3, 1, 3, 2, 1]))
+    assert list(groups) == [1, 2, 3]
+    assert {k: v.tolist() for k, v in groups.items()} == {1: [1, 4], 2: [3], 3: [0, 2]}
+
+
+def test_group_keys():
+    # Grouping the boxes by group_keys gives the same (image, class) groups as a naive loop
+    gt_bbs = BoundingBoxes(gts)
+    det_bbs = BoundingBoxes(dts, image_index=gt_bbs.image_index, class_index=gt_bbs.class_index)
+    naive = {}
+    for idx, bb in enumerate(dts):
+        naive.setdefault((bb.get_image_name(), bb.get_class_id()), []).append(idx)
+    groups = group_indices(det_bbs.group_keys())
+    assert sorted(v.tolist() for v in groups.values()) == sorted(naive.values())
+    # The class only in the detections has its own group
+    assert [4] in [v.tolist() for v in groups.values()]
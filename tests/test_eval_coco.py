@@ -1,7 +1,9 @@
 import json
 from math import isclose
 
+import numpy as np
 from src.bounding_box import BBFormat, BBType, BoundingBox
+from src.bounding_boxes import BoundingBoxes
 from src.evaluators.coco_evaluator import get_coco_summary
 from src.utils.converter import coco2bb
 
@@ -26,3 +28,23 @@ assert abs(res["AR100"] - 0.595353) < tol
 assert abs(res["ARsmall"] - 0.654764) < tol
 assert abs(res["ARmedium"] - 0.603130) < tol
 assert abs(res["ARlarge"] - 0.553744) < tol
+
+
+def test_iou_on_threshold():
+    # IOU exactly 0.7: matched at the thresholds 0.5 to 0.7, i.e. at 5 of the 10 COCO thresholds.
+    # The IOUs are computed in float64 even from float32 coordinates, so the comparison with the
+    # 0.7 threshold does not depend on the type of the coordinates
+    gt = [BoundingBox('img', 'a', (0, 0, 100, 100), format=BBFormat.XYX2Y2)]
+    dt = [
+        BoundingBox('img',
+                    'a', (0, 0, 70, 100),
+                    bb_type=BBType.DETECTED,
+                    confidence=0.9,
+                    format=BBFormat.XYX2Y2)
+    ]
+    for dtype in (np.float64, np.float32):
+        gts_ = BoundingBoxes(gt)
+        dts_ = BoundingBoxes(dt, image_index=gts_.image_index, class_index=gts_.class_index)
+        gts_.xyxy = gts_.xyxy.astype(dtype)
+        dts_.xyxy = dts_.xyxy.astype(dtype)
+        assert isclose(get_coco_summary(gts_, dts_)["AP"], 0.5)
@@ -4,9 +4,13 @@
 
 from math import isclose
 
+import numpy as np
+import pytest
 import src.utils.converter as converter
-from src.evaluators.pascal_voc_evaluator import get_pascalvoc_metrics
-from src.utils.enumerators import BBType, MethodAveragePrecision
+from src.bounding_box import BoundingBox
+from src.evaluators.pascal_voc_evaluator import (_assign, _compute_ious,
+                                                 get_pascalvoc_metrics)
+from src.utils.enumerators import BBFormat, BBType, MethodAveragePrecision
 
 
 def test_case_1():
@@ -38,3 +42,39 @@ def test_case_1():
         results = results_dict['per_class']
         for c, res in results.items():
             assert isclose(expected_APs[c][iou], res['AP'])
+
+
+def test_iou_on_threshold():
+    # A 100x100 gt and a det w pixels wide have IOU exactly w / 100 (edges included), which must
+    # be a TP at that threshold with or without numba (py_func is the pure Python version)
+    assign_py = getattr(_assign, 'py_func', _assign)
+    gt = np.array([[0, 0, 99, 99]], dtype=np.float32)
+    for w in (65, 70, 90, 95):
+        iou_threshold = w / 100
+        dt = np.array([[0, 0, w - 1, 99]], dtype=np.float32)
+        ious = _compute_ious(dt, gt)
+        assert ious.dtype == np.float64
+        assert _assign(ious, iou_threshold).tolist() == [True]
+        assert assign_py(ious, iou_threshold).tolist() == [True]
+
+        gts = [BoundingBox('img', 'a', (0, 0, 99, 99), format=BBFormat.XYX2Y2)]
+        dets = [
+            BoundingBox('img',
+                        'a', (0, 0, w - 1, 99),
+                        bb_type=BBType.DETECTED,
+                        confidence=0.9,
+                        format=BBFormat.XYX2Y2)
+        ]
+        assert isclose(get_pascalvoc_metrics(gts, dets, iou_threshold=iou_threshold)['mAP'], 1.0)
+
+
+def test_assign_numba_matches_python():
+    # The numba-compiled _assign must give the same TP/FP as the plain Python one
+    pytest.importorskip('numba')
+    assert hasattr(_assign, 'py_func')
+    rng = np.random.default_rng(0)
+    for iou_threshold in (0.5, 0.65, 0.7, 0.9, 0.95):
+        # IOUs rounded to 2 decimals, so many of them are equal to the threshold
+        ious = np.round(rng.random((20, 8)), 2)
+        assert _assign(ious, iou_threshold).tolist() == _assign.py_func(ious,
+                                                                         iou_threshold).tolist()
@@ -0,0 +1,21 @@
+import src.utils.general_utils as general_utils
+
+
+def test_get_files_dir(tmp_path):
+    for name in ['b.JPG', 'a.jpg', 'c.Png', 'notes.txt', 'README', 'd.tar.gz']:
+        (tmp_path / name).write_text('')
+    (tmp_path / 'folder.jpg').mkdir()
+    files = ['README', 'a.jpg', 'b.JPG', 'c.Png', 'd.tar.gz', 'folder.jpg', 'notes.txt']
+
+    # '*' and None accept every entry; the names are sorted
+    assert general_utils.get_files_dir(tmp_path, ['*']) == files
+    assert general_utils.get_files_dir(tmp_path, [None]) == files
+    assert general_utils.get_files_dir(tmp_path) == files
+    # The extensions are case insensitive, with or without the dot; directories and files without
+    # extension are left out
+    assert general_utils.get_files_dir(tmp_path, ['jpg', '.PNG']) == ['a.jpg', 'b.JPG', 'c.Png']
+    # Multi-dot extensions are matched by the end of the name
+    assert general_utils.get_files_dir(tmp_path, ['tar.gz']) == ['d.tar.gz']
+    assert general_utils.get_files_dir(tmp_path, ['.gz']) == ['d.tar.gz']
+    # iter_files_dir yields the same names
+    assert sorted(general_utils.iter_files_dir(tmp_path, ['jpg'])) == ['a.jpg', 'b.JPG']